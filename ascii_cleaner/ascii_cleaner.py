@@ -6,9 +6,16 @@
 # (Ä to Ae, Ö to Oe, Ü to Ue, ä to ae, ö to oe, ü to ue, ß to ss).
 # Writes cleaned files to ascii_cleaned and file specific logs to ascii_cleaned/logs when issues occur.
 # Logs include exact line and column numbers of each non ASCII character, a short context excerpt, and iconv stderr.
+# With --engine python the iconv subprocess is skipped: each file is read once in fixed-size chunks and
+# transliterated, dropped or rejected in a single streaming pass (strategy + German map), keeping memory flat.
+# Files that are already pure ASCII (checked via mmap) are copied verbatim (or hard-linked) without conversion.
+# ascii_cleaned/manifest.json remembers size, mtime, SHA-256, settings and outcome per source file, so reruns skip
+# unchanged files and remove outputs whose source is gone.
+# --report writes a JSONL run report (one record per file plus a rollup); --no-logs skips the per-file text logs.
 
-import sys, argparse, pathlib, subprocess, unicodedata, datetime
+import sys, os, re, json, time, hashlib, argparse, pathlib, subprocess, unicodedata, datetime, codecs, mmap, shutil
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 
 GERMAN_MAP = {
     "Ä": "Ae", "Ö": "Oe", "Ü": "Ue",
@@ -19,16 +26,97 @@ GERMAN_MAP = {
 def now_iso():
     return datetime.datetime.now().isoformat(timespec="seconds")
 
-def ascii_transliterate_with_de_map(text: str) -> str:
-    # Apply explicit German mapping first
-    for k, v in GERMAN_MAP.items():
-        text = text.replace(k, v)
-    # Decompose & drop combining marks
-    decomp = unicodedata.normalize("NFKD", text)
-    no_marks = "".join(ch for ch in decomp if not unicodedata.combining(ch))
-    # Keep ASCII only (drop anything left)
+CHUNK_SIZE = 1 << 20  # bytes per read in the streaming engine
+SCAN_BLOCK = 16 << 20  # bytes per mmap slice in the pure-ASCII pre-check
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 2
+
+def translit_codepoint(ch: str) -> str:
+    """
+    ASCII replacement for a single character: German map, else NFKD with combining marks dropped.
+    Returns '' when the character has no ASCII representation.
+    """
+    if ch in GERMAN_MAP:
+        return GERMAN_MAP[ch]
+    decomp = unicodedata.normalize("NFKD", ch)
+    no_marks = "".join(c for c in decomp if not unicodedata.combining(c))
     return no_marks.encode("ascii", "ignore").decode("ascii")
 
+class TranslitTable(dict):
+    """
+    str.translate table {code point: ASCII replacement}. Prefilled for ASCII and common Latin blocks;
+    any other code point is resolved via translit_codepoint() on first sight and cached.
+    """
+    def __init__(self, prefill=range(0x250)):
+        super().__init__()
+        for cp in prefill:
+            self[cp] = chr(cp) if cp < 128 else translit_codepoint(chr(cp))
+
+    def __missing__(self, cp):
+        rep = self[cp] = translit_codepoint(chr(cp))
+        return rep
+
+TRANSLIT_TABLE = TranslitTable()
+
+def ascii_transliterate_with_de_map(text: str) -> str:
+    # One str.translate pass: German map first, then decomposition & dropping of marks/non-ASCII.
+    # Per-character mapping is equivalent to whole-text NFKD because reordered combining marks are dropped anyway.
+    # Works on arbitrary chunks of a larger text.
+    return text.translate(TRANSLIT_TABLE)
+
+def is_plain_ascii(infile: pathlib.Path, block: int = SCAN_BLOCK) -> bool:
+    """
+    True if every byte of infile is < 0x80 and there is no CR, i.e. conversion would not change it
+    (iconv output is read as text, so CRLF becomes LF). Memory-maps the file and checks it slice by slice.
+    """
+    with infile.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return True
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for off in range(0, size, block):
+                part = mm[off:off + block]
+                if not part.isascii() or b"\r" in part:
+                    return False
+    return True
+
+def copy_verbatim(infile: pathlib.Path, outfile: pathlib.Path, link: bool = False):
+    """
+    Place an unchanged copy of infile at outfile: hard link if requested and possible,
+    otherwise an in-kernel copy (copy_file_range, then shutil's sendfile path).
+    """
+    if outfile.exists() or outfile.is_symlink():
+        outfile.unlink()
+    if link:
+        try:
+            os.link(infile, outfile)
+            return
+        except OSError:
+            pass  # cross-device or unsupported → copy instead
+    if hasattr(os, "copy_file_range"):
+        try:
+            with infile.open("rb") as src, outfile.open("wb") as dst:
+                remaining = os.fstat(src.fileno()).st_size
+                while remaining > 0:
+                    n = os.copy_file_range(src.fileno(), dst.fileno(), remaining)
+                    if n == 0:
+                        break
+                    remaining -= n
+                if remaining == 0:
+                    return
+        except OSError:
+            pass  # unsupported filesystem → fall through
+    shutil.copyfile(infile, outfile)
+
+def write_ascii(outfile: pathlib.Path, text: str):
+    """
+    Write text via a temp file + rename, so a hard link left at outfile by copy_verbatim (--link)
+    is replaced instead of overwriting the source through the shared inode.
+    """
+    tmpfile = outfile.with_name(outfile.name + ".part")
+    tmpfile.write_text(text, encoding="ascii", errors="strict")
+    tmpfile.replace(outfile)
+
 def try_iconv(infile: pathlib.Path, mode: str):
     """
     mode: 'translit' | 'ignore' | 'strict'
@@ -46,50 +134,129 @@ def try_iconv(infile: pathlib.Path, mode: str):
     except FileNotFoundError:
         return False, "", "iconv not found"
 
-def scan_non_ascii_positions(text: str, context_chars=30):
+NON_ASCII_RUN = re.compile(r"[^\x00-\x7f]+")
+LOG_MAX_POSITIONS = 50  # occurrences listed per issue log
+SKIP_BLOCK = 1 << 16  # chars per str.isascii() probe before running the regex
+
+def iter_non_ascii_runs(text: str, start: int, end: int):
+    """
+    Yield regex matches of non-ASCII runs in text[start:end].
+    Pure-ASCII blocks are skipped with str.isascii(), which is far faster than the regex engine.
+    A run crossing a block boundary is yielded as two adjacent matches.
+    """
+    for b in range(start, end, SKIP_BLOCK):
+        e = min(b + SKIP_BLOCK, end)
+        if not text[b:e].isascii():
+            yield from NON_ASCII_RUN.finditer(text, b, e)
+
+class NonAsciiScanner:
+    """
+    Incremental non-ASCII scanner. Feed decoded text in chunks, then call finish().
+    Non-ASCII runs are located via iter_non_ascii_runs and line/col are derived by counting newlines
+    between runs, so ASCII stretches never hit a Python loop. Counts and lines are always exact;
+    only the first max_positions occurrences (None = all) get a position record with context.
+    Line/column numbers and context excerpts are identical to scanning the whole text at once.
+    """
+    def __init__(self, context_chars=30, max_positions=None):
+        self.context_chars = context_chars
+        self.max_positions = max_positions
+        self.positions = []
+        self.counts = Counter()
+        self.lines_set = set()
+        self.line = 1
+        self.col = 1
+        self._buf = ""    # trailing context + unscanned text
+        self._start = 0   # index in _buf where unscanned text begins
+
+    def feed(self, text: str):
+        self._buf += text
+        # Hold back context_chars so excerpts can extend into the next chunk
+        end = len(self._buf) - self.context_chars
+        if end > self._start:
+            self._consume(end)
+
+    def finish(self):
+        self._consume(len(self._buf))
+        return {"positions": self.positions, "counts": self.counts, "lines_set": self.lines_set}
+
+    def _advance(self, buf: str, pos: int, upto: int):
+        # Move line/col from offset pos to offset upto
+        nl = buf.count("\n", pos, upto)
+        if nl:
+            self.line += nl
+            self.col = upto - buf.rfind("\n", pos, upto)
+        else:
+            self.col += upto - pos
+
+    def _consume(self, end: int):
+        buf = self._buf
+        ctx = self.context_chars
+        limit = self.max_positions
+        pos = self._start
+        for m in iter_non_ascii_runs(buf, pos, end):
+            run_start = m.start()
+            self._advance(buf, pos, run_start)
+            run = m.group()
+            # "\n" is ASCII, so a run never spans lines
+            self.counts.update(run)
+            self.lines_set.add(self.line)
+            for k, ch in enumerate(run):
+                if limit is not None and len(self.positions) >= limit:
+                    break
+                i = run_start + k
+                try:
+                    name = unicodedata.name(ch)
+                except ValueError:
+                    name = "<unnamed>"
+                # Build context
+                excerpt = buf[max(0, i - ctx):min(len(buf), i + ctx)].replace("\n", "\\n")
+                self.positions.append({
+                    "line": self.line, "col": self.col + k, "char": ch, "cp": f"U+{ord(ch):04X}",
+                    "name": name, "context": excerpt
+                })
+            self.col += len(run)
+            pos = m.end()
+        self._advance(buf, pos, end)
+        # Keep context_chars of already scanned text as left context for the next region
+        keep = max(0, end - ctx)
+        self._buf = buf[keep:]
+        self._start = end - keep
+
+def scan_non_ascii_positions(text: str, context_chars=30, max_positions=None):
     """
     Return dict with:
-      - positions: list of dicts {line, col, char, codepoint, name, context}
+      - positions: list of dicts {line, col, char, codepoint, name, context} (first max_positions)
       - counts: Counter of chars
       - lines_set: set of line numbers
     """
-    positions = []
-    counts = Counter()
-    lines_set = set()
-
-    line = 1
-    col = 1
-    for i, ch in enumerate(text):
-        if ch == "\n":
-            line += 1
-            col = 1
-            continue
-        if ord(ch) > 127 or ch == "\uFFFD":
-            cp = f"U+{ord(ch):04X}"
-            try:
-                name = unicodedata.name(ch)
-            except ValueError:
-                name = "<unnamed>"
-            # Build context
-            start = max(0, i - context_chars)
-            end = min(len(text), i + context_chars)
-            excerpt = text[start:end].replace("\n", "\\n")
-            positions.append({
-                "line": line, "col": col, "char": ch, "cp": cp, "name": name,
-                "context": excerpt
-            })
-            counts[ch] += 1
-            lines_set.add(line)
-        col += 1
-
-    return {"positions": positions, "counts": counts, "lines_set": lines_set}
+    scanner = NonAsciiScanner(context_chars, max_positions)
+    scanner.feed(text)
+    return scanner.finish()
+
+def scan_file(infile: pathlib.Path, max_positions=LOG_MAX_POSITIONS, chunk_size: int = CHUNK_SIZE):
+    """
+    Stream infile through the UTF-8 decoder (invalid bytes → U+FFFD) and scan it without loading it whole.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    scanner = NonAsciiScanner(max_positions=max_positions)
+    with infile.open("rb") as src:
+        while True:
+            raw = src.read(chunk_size)
+            text = decoder.decode(raw, final=not raw)
+            if text:
+                scanner.feed(text)
+            if not raw:
+                break
+    return scanner.finish()
 
 def write_issue_log(logfile: pathlib.Path, infile: pathlib.Path, outcome: str,
-                    iconv_err_primary: str, iconv_err_ignore: str, original_text: str):
+                    iconv_err_primary: str, iconv_err_ignore: str, original_text: str, scan=None):
     """
     Write a file-specific log with full diagnostics.
+    Pass a precomputed scan (see NonAsciiScanner) to avoid rescanning original_text.
     """
-    scan = scan_non_ascii_positions(original_text)
+    if scan is None:
+        scan = scan_non_ascii_positions(original_text, max_positions=LOG_MAX_POSITIONS)
     positions = scan["positions"]
     counts = scan["counts"]
     lines = sorted(scan["lines_set"])
@@ -107,7 +274,7 @@ def write_issue_log(logfile: pathlib.Path, infile: pathlib.Path, outcome: str,
             f.write(iconv_err_ignore + "\n")
 
         f.write("\n## Non-ASCII analysis (original content)\n")
-        if not positions:
+        if not counts:
             f.write("No non-ASCII characters detected in decoded text.\n")
         else:
             total = sum(counts.values())
@@ -127,8 +294,8 @@ def write_issue_log(logfile: pathlib.Path, infile: pathlib.Path, outcome: str,
             # Print as a compact, comma-separated list
             f.write(", ".join(str(n) for n in lines) + "\n")
 
-            f.write("\nfirst_occurrences (up to 50):\n")
-            for idx, pos in enumerate(positions[:50], 1):
+            f.write(f"\nfirst_occurrences (up to {LOG_MAX_POSITIONS}):\n")
+            for idx, pos in enumerate(positions[:LOG_MAX_POSITIONS], 1):
                 mapped = GERMAN_MAP.get(pos["char"], "")
                 map_str = f" | mapped_to='{mapped}'" if mapped else ""
                 f.write(
@@ -137,51 +304,255 @@ def write_issue_log(logfile: pathlib.Path, infile: pathlib.Path, outcome: str,
                     f"    context: ...{pos['context']}...\n"
                 )
 
-def process_one(infile: pathlib.Path, outdir: pathlib.Path, strategy: str, fallback: bool, logs_dir: pathlib.Path):
+def stream_convert(infile: pathlib.Path, outfile: pathlib.Path, strategy: str, fallback: bool,
+                   chunk_size: int = CHUNK_SIZE):
+    """
+    Pure-Python replacement for the iconv chain: one read of infile in chunks, output written as it goes.
+      translit: German map + decomposition; chars without ASCII form are dropped (issue)
+      ignore:   every non-ASCII char is dropped (issue)
+      strict:   any non-ASCII char is an issue; converted like translit if fallback, else no output
+    Invalid UTF-8 is decoded as U+FFFD and dropped (issue).
+    Returns (outcome, scan); outcome is None when the file converted cleanly.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    scanner = NonAsciiScanner(max_positions=LOG_MAX_POSITIONS)
+    tmpfile = outfile.with_name(outfile.name + ".part")
+    rejected = False
+    with infile.open("rb") as src, tmpfile.open("wb") as dst:
+        while True:
+            raw = src.read(chunk_size)
+            text = decoder.decode(raw, final=not raw)
+            if text:
+                scanner.feed(text)
+                if text.isascii():
+                    if not rejected:
+                        dst.write(text.encode("ascii"))
+                elif strategy == "strict" and not fallback:
+                    # Keep scanning for the log, but stop producing output
+                    rejected = True
+                elif not rejected:
+                    if strategy == "ignore":
+                        out = text.encode("ascii", "ignore")
+                    else:
+                        out = ascii_transliterate_with_de_map(text).encode("ascii")
+                    dst.write(out)
+            if not raw:
+                break
+    scan = scanner.finish()
+
+    if rejected:
+        tmpfile.unlink()
+        return "error_no_fallback", scan
+    tmpfile.replace(outfile)
+    counts = scan["counts"]
+    if strategy == "ignore":
+        dropped = sum(counts.values())
+    else:
+        dropped = sum(n for ch, n in counts.items() if not TRANSLIT_TABLE[ord(ch)])
+    if strategy == "strict" and counts:
+        return "python_fallback_de_map", scan
+    if strategy == "ignore" and dropped:
+        return "python_ignore", scan
+    if dropped:
+        return "python_translit_dropped", scan
+    return None, scan
+
+def line_ranges(lines) -> list:
     """
-    Returns (status, console_message)
-    status ∈ {'OK','ISSUE'}
+    Compress line numbers into sorted [first, last] ranges: {1,2,3,7} → [[1, 3], [7, 7]].
+    """
+    ranges = []
+    for n in sorted(lines):
+        if ranges and n == ranges[-1][1] + 1:
+            ranges[-1][1] = n
+        else:
+            ranges.append([n, n])
+    return ranges
+
+def summarize_scan(outcome: str, scan) -> dict:
+    """
+    Compact, picklable diagnostics for the run report: per-code-point counts and affected line ranges.
+    """
+    if scan is None:
+        return {"outcome": outcome, "counts": {}, "line_ranges": []}
+    counts = {f"U+{ord(ch):04X}": n for ch, n in scan["counts"].most_common()}
+    return {"outcome": outcome, "counts": counts, "line_ranges": line_ranges(scan["lines_set"])}
+
+def process_one(infile: pathlib.Path, outdir: pathlib.Path, strategy: str, fallback: bool, logs_dir: pathlib.Path,
+                engine: str = "iconv", link: bool = False, write_logs: bool = True, diagnostics: bool = False):
+    """
+    Returns (status, console_message, diag)
+    status ∈ {'OK','ISSUE'}; diag is summarize_scan() output (counts only filled for OK files if diagnostics)
     """
     outfile = outdir / infile.name
     logpath = logs_dir / (infile.stem + ".log")
 
+    def issue(outcome, scan, err1="", err2=""):
+        if not write_logs:
+            return "ISSUE", f"ISSUE  {infile.name} ({outcome})", summarize_scan(outcome, scan)
+        write_issue_log(logpath, infile, outcome, err1 or "", err2 or "", None, scan=scan)
+        return "ISSUE", f"ISSUE  {infile.name} → logs/{logpath.name}", summarize_scan(outcome, scan)
+
+    # Common case: already ASCII with LF line endings → nothing to convert
+    if is_plain_ascii(infile):
+        copy_verbatim(infile, outfile, link)
+        return "OK", f"OK     {infile.name}", summarize_scan("ascii_copy", None)
+
+    if engine == "python":
+        outcome, scan = stream_convert(infile, outfile, strategy, fallback)
+        if outcome is None:
+            return "OK", f"OK     {infile.name}", summarize_scan(f"python_{strategy}", scan)
+        return issue(outcome, scan)
+
     # Try iconv (primary)
     ok, data, err1 = try_iconv(infile, "translit" if strategy == "translit" else strategy)
     if ok and not err1:
-        outfile.write_text(data, encoding="ascii", errors="strict")
-        return "OK", f"OK     {infile.name}"
+        write_ascii(outfile, data)
+        scan = scan_file(infile) if diagnostics else None
+        return "OK", f"OK     {infile.name}", summarize_scan(f"iconv_{strategy}", scan)
 
     # If iconv primary succeeded but had stderr warnings → log as issue anyway
     if ok and err1:
-        outfile.write_text(data, encoding="ascii", errors="strict")
-        original = infile.read_bytes().decode("utf-8", errors="replace")
-        write_issue_log(logpath, infile, "iconv_translit_with_warnings", err1, "", original)
-        return "ISSUE", f"ISSUE  {infile.name} → logs/{logpath.name}"
+        write_ascii(outfile, data)
+        return issue("iconv_translit_with_warnings", scan_file(infile), err1)
 
     # Try iconv(ignore)
     ok2, data2, err2 = try_iconv(infile, "ignore")
     if ok2:
-        outfile.write_text(data2, encoding="ascii", errors="strict")
-        original = infile.read_bytes().decode("utf-8", errors="replace")
-        write_issue_log(logpath, infile, "iconv_ignore", err1 or "", err2 or "", original)
-        return "ISSUE", f"ISSUE  {infile.name} → logs/{logpath.name}"
+        write_ascii(outfile, data2)
+        return issue("iconv_ignore", scan_file(infile), err1, err2)
 
     # Fallback
     if not fallback:
-        original = infile.read_bytes().decode("utf-8", errors="replace")
-        write_issue_log(logpath, infile, "error_no_fallback", err1 or "", err2 or "", original)
-        return "ISSUE", f"ISSUE  {infile.name} → logs/{logpath.name}"
+        return issue("error_no_fallback", scan_file(infile), err1, err2)
+
+    # Invalid bytes decode to U+FFFD, which the transliteration drops like a strict-decode failure would
+    _, scan = stream_convert(infile, outfile, "translit", True)
+    return issue("python_fallback_de_map", scan, err1, err2)
+
+def file_sha256(path: pathlib.Path, chunk_size: int = CHUNK_SIZE) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(chunk_size), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def process_entry(job):
+    """
+    Worker entry point (top-level so ProcessPoolExecutor can pickle it).
+    Returns (status, console_message, diag, fingerprint); fingerprint identifies the source for the manifest,
+    diag (see summarize_scan) gains the conversion time for the run report.
+    """
+    infile = job[0]
+    st = infile.stat()
+    t0 = time.perf_counter()
+    status, msg, diag = process_one(*job)
+    diag["seconds"] = round(time.perf_counter() - t0, 4)
+    return status, msg, diag, {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "sha256": file_sha256(infile)}
 
-    raw = infile.read_bytes()
+def load_manifest(path: pathlib.Path) -> dict:
+    """
+    Return {relative_source_path: entry} from a previous run, or {} if missing/unreadable/outdated.
+    """
     try:
-        original = raw.decode("utf-8")  # prefer strict decode if possible
-    except UnicodeDecodeError:
-        original = raw.decode("utf-8", errors="replace")
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("files", {})
 
-    cleaned = ascii_transliterate_with_de_map(original)
-    outfile.write_text(cleaned, encoding="ascii", errors="strict")
-    write_issue_log(logpath, infile, "python_fallback_de_map", err1 or "", err2 or "", original)
-    return "ISSUE", f"ISSUE  {infile.name} → logs/{logpath.name}"
+def save_manifest(path: pathlib.Path, entries: dict):
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps({"version": MANIFEST_VERSION, "time": now_iso(), "files": entries},
+                              indent=1, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+def unchanged_entry(infile: pathlib.Path, prev: dict, settings: dict, outdir: pathlib.Path,
+                    logs_dir: pathlib.Path, need_diag: bool = False):
+    """
+    Return the (refreshed) manifest entry if infile needs no conversion, else None.
+    Size and mtime decide cheaply; a touched file of equal size is compared by content hash.
+    need_diag (--report) also requires the recorded diagnostics to include counts for OK files.
+    """
+    if prev is None or any(prev.get(k) != v for k, v in settings.items()):
+        return None
+    if not (outdir / prev.get("output", "")).is_file():
+        return None
+    if prev.get("log") and not (logs_dir / prev["log"]).is_file():
+        return None
+    if "diag" not in prev or (need_diag and prev.get("status") == "OK" and not prev.get("diagnostics")):
+        return None
+    st = infile.stat()
+    if prev.get("size") != st.st_size:
+        return None
+    if prev.get("mtime_ns") == st.st_mtime_ns:
+        return prev
+    if file_sha256(infile) != prev.get("sha256"):
+        return None
+    return dict(prev, mtime_ns=st.st_mtime_ns)
+
+def remove_outputs(entry: dict, outdir: pathlib.Path, logs_dir: pathlib.Path, keep_output: bool = False):
+    """
+    Delete the converted file and/or issue log recorded in a manifest entry (if present).
+    """
+    targets = [] if keep_output else [outdir / entry.get("output", "")]
+    if entry.get("log"):
+        targets.append(logs_dir / entry["log"])
+    for t in targets:
+        if t.is_file():
+            t.unlink()
+
+class RunReport:
+    """
+    Streaming JSONL run report: one "file" record per input as it finishes, then one "rollup" record
+    with totals and the top offending characters. Only the rollup counters are kept in memory.
+    """
+    def __init__(self, path: pathlib.Path):
+        self.path = path
+        self.f = path.open("w", encoding="utf-8")
+        self.t0 = time.perf_counter()
+        self.status = Counter()
+        self.chars = Counter()       # code point → occurrences
+        self.char_files = Counter()  # code point → files containing it
+
+    def add(self, key: str, status: str, diag: dict, skipped: bool = False):
+        self.status[status] += 1
+        self.status["SKIPPED"] += skipped
+        counts = diag.get("counts", {})
+        self.chars.update(counts)
+        self.char_files.update(counts.keys())
+        rec = {"type": "file", "file": key, "status": status, "skipped": skipped,
+               "non_ascii_total": sum(counts.values()), **diag}
+        self.f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+
+    def close(self, top: int = 20):
+        top_chars = []
+        for cp, n in self.chars.most_common(top):
+            ch = chr(int(cp[2:], 16))
+            top_chars.append({"cp": cp, "char": ch, "name": unicodedata.name(ch, "<unnamed>"),
+                              "count": n, "files": self.char_files[cp], "mapped_to": GERMAN_MAP.get(ch, "")})
+        rec = {"type": "rollup", "time": now_iso(), "seconds": round(time.perf_counter() - self.t0, 3),
+               "ok": self.status["OK"], "issue": self.status["ISSUE"], "skipped": self.status["SKIPPED"],
+               "non_ascii_total": sum(self.chars.values()), "unique_non_ascii": len(self.chars),
+               "top_non_ascii": top_chars}
+        self.f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self.f.close()
+
+def run_jobs(jobs, workers: int):
+    """
+    Yield process_entry() results for each job tuple in input order.
+    workers <= 1 runs in-process; otherwise jobs go to a process pool.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        for job in jobs:
+            yield process_entry(job)
+        return
+    # Small chunks keep results flowing to the console while amortizing IPC
+    chunksize = max(1, min(32, len(jobs) // (workers * 8)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # map() returns results in submission order → stable output
+        yield from pool.map(process_entry, jobs, chunksize=chunksize)
 
 def main():
     ap = argparse.ArgumentParser(description="Convert files to ASCII with diagnostics and per-file logs on issues.")
@@ -191,7 +562,21 @@ def main():
                     help="translit=best effort (default); ignore=drops unmappables; strict=fails if any unmappable (then fallback)")
     ap.add_argument("--recursive", action="store_true", help="recurse into subdirectories")
     ap.add_argument("--no-fallback", action="store_true", help="disable Python fallback")
+    ap.add_argument("--engine", choices=["iconv","python"], default="iconv",
+                    help="iconv=iconv subprocess chain (default); python=in-process streaming conversion, no iconv needed")
+    ap.add_argument("--link", action="store_true",
+                    help="hard-link pure-ASCII files into ascii_cleaned instead of copying them")
+    ap.add_argument("--jobs", type=int, default=1, metavar="N",
+                    help="parallel worker processes (default: 1; 0 = all CPU cores)")
+    ap.add_argument("--force", action="store_true",
+                    help="ignore the manifest and convert every file again")
+    ap.add_argument("--report", metavar="FILE",
+                    help="write a JSONL run report (per-file outcome, code point counts, line ranges, timing, rollup)")
+    ap.add_argument("--no-logs", action="store_true", help="do not write per-file text logs for issues")
     args = ap.parse_args()
+    if args.jobs < 0:
+        print("Error: --jobs must be >= 0", file=sys.stderr); sys.exit(1)
+    workers = args.jobs or os.cpu_count() or 1
 
     base = pathlib.Path(args.folder)
     if not base.is_dir():
@@ -203,22 +588,73 @@ def main():
     logs_dir.mkdir(exist_ok=True)
 
     pattern = f"**/*.{args.extension}" if args.recursive else f"*.{args.extension}"
-    files = [p for p in base.glob(pattern) if p.is_file()]
+    # Never pick up our own outputs as inputs in recursive mode
+    files = [p for p in base.glob(pattern) if p.is_file() and outdir not in p.parents]
     if not files:
         print(f"No .{args.extension} files found in {base}")
         return
 
+    manifest_path = outdir / MANIFEST_NAME
+    previous = {} if args.force else load_manifest(manifest_path)
+    settings = {"strategy": args.strategy, "engine": args.engine, "fallback": not args.no_fallback,
+                "link": args.link, "logs": not args.no_logs}
+
+    entries = {}
+    skipped = {}
+    todo = []
+    for f in sorted(files):
+        key = f.relative_to(base).as_posix()
+        entry = unchanged_entry(f, previous.get(key), settings, outdir, logs_dir, need_diag=bool(args.report))
+        if entry is not None:
+            skipped[key] = entry
+        else:
+            todo.append((key, f))
+
+    # Sources that disappeared since the last run → drop their outputs and logs
+    current = {f.relative_to(base).as_posix() for f in files}
+    live_outputs = {f.name for f in files}
+    for key, entry in previous.items():
+        if key not in current:
+            remove_outputs(entry, outdir, logs_dir, keep_output=entry.get("output") in live_outputs)
+
     ok_count = 0
     issue_count = 0
+    skip_count = 0
+    report = RunReport(pathlib.Path(args.report)) if args.report else None
+    jobs = [(f, outdir, args.strategy, not args.no_fallback, logs_dir, args.engine, args.link,
+             not args.no_logs, report is not None) for _, f in todo]
+    results = run_jobs(jobs, workers)
     for f in sorted(files):
-        status, msg = process_one(f, outdir, args.strategy, not args.no_fallback, logs_dir)
-        print(msg)
+        key = f.relative_to(base).as_posix()
+        if key in skipped:
+            entry = skipped[key]
+            status = entry["status"]
+            skip_count += 1
+            print(f"SKIP   {f.name} ({status})", flush=True)
+            if report:
+                report.add(key, status, entry["diag"], skipped=True)
+        else:
+            status, msg, diag, fingerprint = next(results)
+            has_log = status != "OK" and not args.no_logs
+            prev = previous.get(key)
+            if prev and prev.get("log") and not has_log:
+                remove_outputs(prev, outdir, logs_dir, keep_output=True)
+            entry = dict(fingerprint, **settings, status=status, output=f.name,
+                         log=(f.stem + ".log") if has_log else None, time=now_iso(),
+                         diag={k: v for k, v in diag.items() if k != "seconds"}, diagnostics=report is not None)
+            print(msg, flush=True)
+            if report:
+                report.add(key, status, diag)
+        entries[key] = entry
         if status == "OK":
             ok_count += 1
         else:
             issue_count += 1
 
-    print(f"\nSummary: OK={ok_count}  ISSUE={issue_count}")
+    save_manifest(manifest_path, entries)
+    if report:
+        report.close()
+    print(f"\nSummary: OK={ok_count}  ISSUE={issue_count}  (skipped unchanged: {skip_count})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+
+# This script benchmarks the conversion paths of ascii_cleaner.py on a synthetic QEF-like corpus.
+# It generates CSV files with a configurable file count, file size and non-ASCII density (German umlauts,
+# CJK ideographs, invalid UTF-8 bytes), then runs every engine/strategy combination on the same corpus.
+# Each variant runs in a fresh interpreter so peak RSS is attributable to that variant alone.
+# Results (files/s, MB/s, peak RSS, OK/ISSUE counts) are printed or written as JSON for regression tracking.
+
+import sys, os, json, time, random, shutil, argparse, pathlib, platform, tempfile, multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent))
+import ascii_cleaner
+
+VARIANTS = [
+    "iconv:translit", "iconv:ignore", "iconv:strict",
+    "python:translit", "python:ignore", "python:strict",
+]
+
+NON_ASCII = {
+    "umlaut": "ÄÖÜäöüßéèàç",
+    "cjk": "日本語中文字東京大阪",
+}
+INVALID_BYTES = [b"\xff", b"\xfe", b"\xc3", b"\xe2\x82", b"\x80"]
+WORDS = ["host", "server", "gateway", "printer", "office", "floor", "building", "lab", "core", "edge",
+         "dhcp", "dns", "switch", "router", "client", "backup", "mail", "proxy", "vpn", "test"]
+
+def parse_size(text: str) -> int:
+    """
+    '4096', '64K', '1.5M', '2G' → bytes
+    """
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+    text = text.strip().upper().rstrip("B")
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+def parse_mix(text: str) -> dict:
+    """
+    'umlaut=0.7,cjk=0.2,invalid=0.1' → normalized weights
+    """
+    mix = {}
+    for part in text.split(","):
+        if not part.strip():
+            continue
+        k, _, v = part.partition("=")
+        k = k.strip()
+        if k not in NON_ASCII and k != "invalid":
+            raise ValueError(f"unknown mix kind: {k}")
+        mix[k] = float(v)
+    total = sum(mix.values())
+    if total <= 0:
+        raise ValueError("mix weights must add up to > 0")
+    return {k: v / total for k, v in mix.items()}
+
+def gen_line(rng: random.Random, obj_id: int, density: float, kinds, weights) -> bytes:
+    name = f"{rng.choice(WORDS)}{obj_id}"
+    desc = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 10)))
+    ip = f"10.{rng.randint(0, 255)}.{rng.randint(0, 255)}.{rng.randint(1, 254)}"
+    out = bytearray(f"{obj_id},{name},{ip},example.com,".encode("ascii"))
+    for ch in desc:
+        if density and rng.random() < density:
+            kind = rng.choices(kinds, weights)[0]
+            out += rng.choice(INVALID_BYTES) if kind == "invalid" else rng.choice(NON_ASCII[kind]).encode("utf-8")
+        else:
+            out += ch.encode("ascii")
+    out += b"\n"
+    return bytes(out)
+
+def generate_corpus(folder: pathlib.Path, files: int, size: int, density: float, mix: dict,
+                    ascii_share: float, seed: int) -> int:
+    """
+    Write `files` QEF-like CSV files of roughly `size` bytes each. A share of files stays pure ASCII.
+    Returns total bytes written.
+    """
+    rng = random.Random(seed)
+    kinds, weights = list(mix), list(mix.values())
+    total = 0
+    for n in range(files):
+        file_density = 0.0 if rng.random() < ascii_share else density
+        with (folder / f"bench_{n:05d}.qef").open("wb") as f:
+            written = f.write(b"obj_id,obj_name,ip_addr,domain,description\n")
+            obj_id = 1
+            while written < size:
+                written += f.write(gen_line(rng, obj_id, file_density, kinds, weights))
+                obj_id += 1
+        total += written
+    return total
+
+def peak_rss_bytes(who):
+    if resource is None:
+        return None
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss if platform.system() == "Darwin" else rss * 1024
+
+def run_variant(corpus: str, variant: str, jobs: int) -> dict:
+    """
+    Convert the whole corpus with one engine:strategy pair (runs in a fresh worker process).
+    """
+    engine, strategy = variant.split(":")
+    base = pathlib.Path(corpus)
+    outdir = base / f"out_{engine}_{strategy}"
+    logs_dir = outdir / "logs"
+    logs_dir.mkdir(parents=True, exist_ok=True)
+    files = sorted(base.glob("*.qef"))
+    work = [(f, outdir, strategy, True, logs_dir, engine) for f in files]
+    status = {"OK": 0, "ISSUE": 0}
+    t0 = time.perf_counter()
+    for st, _msg, _diag, _fp in ascii_cleaner.run_jobs(work, jobs):
+        status[st] += 1
+    seconds = time.perf_counter() - t0
+    shutil.rmtree(outdir, ignore_errors=True)
+    return {
+        "seconds": seconds, "ok": status["OK"], "issue": status["ISSUE"],
+        "peak_rss_bytes": peak_rss_bytes(resource.RUSAGE_SELF) if resource else None,
+        "peak_rss_children_bytes": peak_rss_bytes(resource.RUSAGE_CHILDREN) if resource else None,
+    }
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark ascii_cleaner engines and strategies on a synthetic corpus.")
+    ap.add_argument("--files", type=int, default=200, help="number of files (default: 200)")
+    ap.add_argument("--size", default="256K", help="approx. size per file, e.g. 64K, 4M (default: 256K)")
+    ap.add_argument("--density", type=float, default=0.01,
+                    help="share of description characters replaced by non-ASCII content (default: 0.01)")
+    ap.add_argument("--mix", default="umlaut=0.8,cjk=0.15,invalid=0.05",
+                    help="weights of non-ASCII kinds: umlaut, cjk, invalid (default: umlaut=0.8,cjk=0.15,invalid=0.05)")
+    ap.add_argument("--ascii-share", type=float, default=0.0, help="share of files kept pure ASCII (default: 0)")
+    ap.add_argument("--seed", type=int, default=42, help="random seed for the corpus (default: 42)")
+    ap.add_argument("--variants", default=",".join(VARIANTS),
+                    help="comma-separated engine:strategy pairs (default: all)")
+    ap.add_argument("--jobs", type=int, default=1, help="worker processes per variant, as ascii_cleaner --jobs (default: 1)")
+    ap.add_argument("--repeat", type=int, default=1, help="runs per variant, best time is reported (default: 1)")
+    ap.add_argument("--corpus", help="corpus folder to create/reuse and keep (default: temporary, removed afterwards)")
+    ap.add_argument("--out", help="write JSON results to this file instead of stdout")
+    args = ap.parse_args()
+
+    try:
+        mix = parse_mix(args.mix)
+        size = parse_size(args.size)
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr); sys.exit(1)
+    variants = [v.strip() for v in args.variants.split(",") if v.strip()]
+    for v in variants:
+        if v not in VARIANTS:
+            print(f"Error: unknown variant {v} (choose from {', '.join(VARIANTS)})", file=sys.stderr); sys.exit(1)
+    if shutil.which("iconv") is None:
+        skipped = [v for v in variants if v.startswith("iconv:")]
+        if skipped:
+            print(f"[WARN] iconv not found, skipping {', '.join(skipped)}", file=sys.stderr)
+        variants = [v for v in variants if not v.startswith("iconv:")]
+    workers = args.jobs or os.cpu_count() or 1
+
+    tmp = None
+    if args.corpus:
+        corpus = pathlib.Path(args.corpus)
+        corpus.mkdir(parents=True, exist_ok=True)
+    else:
+        tmp = tempfile.TemporaryDirectory(prefix="ascii_bench_")
+        corpus = pathlib.Path(tmp.name)
+
+    try:
+        existing = sorted(corpus.glob("bench_*.qef"))
+        if len(existing) == args.files and args.corpus:
+            total_bytes = sum(p.stat().st_size for p in existing)
+            print(f"Reusing corpus {corpus} ({args.files} files)", file=sys.stderr)
+        else:
+            for p in existing:
+                p.unlink()
+            t0 = time.perf_counter()
+            total_bytes = generate_corpus(corpus, args.files, size, args.density, mix, args.ascii_share, args.seed)
+            print(f"Generated {args.files} files, {total_bytes / 1e6:.1f} MB in {time.perf_counter() - t0:.1f}s",
+                  file=sys.stderr)
+
+        results = []
+        ctx = multiprocessing.get_context("spawn")
+        for v in variants:
+            runs = []
+            for _ in range(max(1, args.repeat)):
+                # Fresh interpreter per run → clean peak RSS
+                with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+                    runs.append(pool.submit(run_variant, str(corpus), v, workers).result())
+            best = min(runs, key=lambda r: r["seconds"])
+            sec = best["seconds"] or 1e-9
+            res = {
+                "variant": v, "seconds": round(sec, 4),
+                "files_per_s": round(args.files / sec, 2), "mb_per_s": round(total_bytes / 1e6 / sec, 2),
+                "ok": best["ok"], "issue": best["issue"],
+                "peak_rss_bytes": max((r["peak_rss_bytes"] or 0) for r in runs) or None,
+                "peak_rss_children_bytes": max((r["peak_rss_children_bytes"] or 0) for r in runs) or None,
+            }
+            results.append(res)
+            print(f"{v:16s} {res['seconds']:9.3f}s {res['files_per_s']:10.1f} files/s {res['mb_per_s']:8.1f} MB/s",
+                  file=sys.stderr)
+    finally:
+        if tmp:
+            tmp.cleanup()
+
+    report = {
+        "time": ascii_cleaner.now_iso(),
+        "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+        "corpus": {"files": args.files, "size": size, "bytes": total_bytes, "density": args.density,
+                   "mix": mix, "ascii_share": args.ascii_share, "seed": args.seed},
+        "jobs": workers, "repeat": args.repeat,
+        "results": results,
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        pathlib.Path(args.out).write_text(text + "\n", encoding="utf-8")
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
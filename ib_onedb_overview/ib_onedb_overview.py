@@ -4,27 +4,440 @@
 # CSV files summarizing DNS zones (incl. forwarders, AD integration, and dynamic DNS settings)
 # and DHCP configuration (networks, ranges, reservations, and custom DHCP options).  
 # Zones are grouped and optionally split by DNS view.
+# With --diff, two backups are compared instead: added, removed and changed objects per type, from per-object hashes.
+# With --jobs N, a plain onedb.xml is split into byte ranges at <OBJECT boundaries and parsed in N worker processes.
 
 
-import argparse, os, zipfile, sys, csv, json, re
+import argparse, os, zipfile, sys, csv, json, re, io, queue, threading, hashlib, sqlite3, time
+from contextlib import contextmanager
 from pathlib import Path
 from xml.etree import ElementTree as ET
-from collections import defaultdict
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 
-def iter_objects(xml_path):
-    for event, elem in ET.iterparse(xml_path, events=("end",)):
-        if elem.tag == "OBJECT":
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+READ_BUFFER_SIZE = 4 << 20  # bytes per read from onedb.xml or the ZIP member stream
+CHUNKS_PER_JOB = 4          # --jobs: byte ranges per worker, for load balancing
+PROGRESS_INTERVAL = 2.0     # --progress: seconds between progress lines
+OBJECT_START = re.compile(rb"<OBJECT[\s>/]")
+XML_ENCODING = re.compile(rb"""<\?xml[^>]*encoding=["']([A-Za-z0-9._-]+)["']""")
+
+# Object types main() reads, with the PROPERTYs it uses (the columns loaded from the object cache);
+# PROPERTYs of all other objects are never collected
+USED_PROPERTIES = {
+    ".com.infoblox.dns.option_definition": ("name", "code", "option_space", "is_ipv6"),
+    ".com.infoblox.dns.zone": ("zone", "name", "fqdn", "display_name", "zone_type", "primary_type",
+                               "is_external_primary", "is_multimaster", "disabled"),
+    ".com.infoblox.dns.zone_properties": ("zone", "parent", "allow_ddns_updates", "ms_ddns_mode",
+                                          "ddns_principal_tracking", "ddns_restrict_secure",
+                                          "zone_transfer_list_option", "check_names_for_ddns_and_zone_transfer"),
+    ".com.infoblox.dns.zone_forwarder": ("zone", "position", "address", "ds_name"),
+    ".com.infoblox.dns.zone_forwarding_server": ("zone", "forwarders_only", "use_override_forwarders"),
+    ".com.infoblox.dns.zone_ad_server": ("zone", "address"),
+    ".com.infoblox.dns.network": ("address", "cidr", "network_view", "is_ipv4", "disabled", "authoritative",
+                                  "lease_time", "comment", "ddns_updates_enabled", "ddns_server_use_fqdn",
+                                  "ddns_no_client_fqdn", "ddns_use_client_fqdn", "ddns_domainname", "ddns_ttl",
+                                  "override_custom_options", "override_ddns_updates",
+                                  "override_domain_name_servers", "override_routers", "broadcast_address",
+                                  "domain_name", "next_server", "boot_server", "boot_file"),
+    ".com.infoblox.dns.dhcp_range": ("network", "start_address", "end_address", "network_view", "is_ipv4",
+                                     "disabled", "member", "lease_time", "comment", "override_custom_options",
+                                     "override_domain_name_servers", "override_routers", "next_server",
+                                     "boot_server", "boot_file"),
+    ".com.infoblox.dns.fixed_address": ("ip_address", "ipv4addr", "mac_address", "mac", "name", "domain_name",
+                                        "network", "network_view", "lease_time", "comment"),
+    ".com.infoblox.dns.option": ("parent", "option_definition", "value", "is_ipv4"),
+}
+USED_TYPES = set(USED_PROPERTIES)
+
+# --only groups; single types may also be given by their short name ("zone_forwarder") or full __type
+ONLY_GROUPS = {
+    "dns": {".com.infoblox.dns.zone", ".com.infoblox.dns.zone_properties", ".com.infoblox.dns.zone_forwarder",
+            ".com.infoblox.dns.zone_forwarding_server", ".com.infoblox.dns.zone_ad_server"},
+    "dhcp": {".com.infoblox.dns.network", ".com.infoblox.dns.dhcp_range", ".com.infoblox.dns.fixed_address",
+             ".com.infoblox.dns.option", ".com.infoblox.dns.option_definition"},
+}
+
+# Types the CSVs of a selected type are built from: zone-child tables are joined onto zones,
+# options_json needs options and their definitions
+ONLY_REQUIRES = {
+    ".com.infoblox.dns.zone_properties": {".com.infoblox.dns.zone"},
+    ".com.infoblox.dns.zone_forwarder": {".com.infoblox.dns.zone"},
+    ".com.infoblox.dns.zone_forwarding_server": {".com.infoblox.dns.zone"},
+    ".com.infoblox.dns.zone_ad_server": {".com.infoblox.dns.zone"},
+    ".com.infoblox.dns.network": {".com.infoblox.dns.option", ".com.infoblox.dns.option_definition"},
+    ".com.infoblox.dns.dhcp_range": {".com.infoblox.dns.option", ".com.infoblox.dns.option_definition"},
+}
+# Types that have a CSV of their own
+CSV_TYPES = {".com.infoblox.dns.zone", ".com.infoblox.dns.network", ".com.infoblox.dns.dhcp_range",
+             ".com.infoblox.dns.fixed_address"}
+
+# Option parents that end up in options_json, by their __type prefix
+OPTION_PARENT_KINDS = {".com.infoblox.dns.network": "network", ".com.infoblox.dns.dhcp_range": "dhcp_range"}
+
+# --diff: PROPERTYs that identify an object of each type across two backups
+DIFF_KEYS = {
+    ".com.infoblox.dns.option_definition": ("option_space", "is_ipv6", "code"),
+    ".com.infoblox.dns.zone": ("zone", "name"),
+    ".com.infoblox.dns.zone_properties": ("zone", "parent"),
+    ".com.infoblox.dns.zone_forwarder": ("zone", "position"),
+    ".com.infoblox.dns.zone_forwarding_server": ("zone",),
+    ".com.infoblox.dns.zone_ad_server": ("zone", "address"),
+    ".com.infoblox.dns.network": ("address", "cidr", "network_view"),
+    ".com.infoblox.dns.dhcp_range": ("start_address", "end_address", "network_view"),
+    ".com.infoblox.dns.fixed_address": ("ip_address", "ipv4addr", "network_view"),
+    ".com.infoblox.dns.option": ("parent", "option_definition"),
+}
+
+CACHE_SUFFIX = ".overview_cache.sqlite"  # object cache file, next to the input
+CACHE_VERSION = "2"                       # bump when the cache layout changes
+CACHE_NO_VALUE = 0                        # stored for a PROPERTY without VALUE (NULL = property absent)
+CACHE_BATCH = 10000                       # rows per executemany()
+
+def iter_objects(source, types=None, counts=None):
+    """
+    Yield (__type, {NAME: VALUE}) per OBJECT of `source` (path or binary stream); with `types`,
+    other objects are skipped without building their property dict. The root (DATABASE, or CHUNK
+    of a byte range) is cleared after each OBJECT, its direct children, so memory stays flat
+    regardless of file size. `counts` (a Counter) receives every __type seen, skipped ones included.
+    """
+    events = ET.iterparse(source, events=("start", "end"))
+    try:
+        _, root = next(events)
+    except StopIteration:
+        return
+    for event, elem in events:
+        if event != "end" or elem.tag != "OBJECT":
+            continue
+        t = None
+        for prop in elem:  # __type is normally the first PROPERTY
+            if prop.get("NAME") == "__type":
+                t = prop.get("VALUE")
+                break
+        if counts is not None:
+            counts[t] += 1
+        if types is None or t in types:
             props = {}
-            for prop in elem.findall("PROPERTY"):
-                name = prop.attrib.get("NAME")
-                val = prop.attrib.get("VALUE")
+            for prop in elem.iterfind("PROPERTY"):
+                name = prop.get("NAME")
                 if name is not None:
-                    props[name] = val
-            t = props.get("__type")
+                    props[name] = prop.get("VALUE")
             yield t, props
-            elem.clear()
+        root.clear()
+
+class ParseStats:
+    """
+    Throughput and phase timings of one run: bytes parsed (plain file or uncompressed ZIP stream
+    position), objects per __type and seconds per phase. With progress=True, a progress line is
+    written to stderr every PROGRESS_INTERVAL seconds while an input is parsed.
+    """
+
+    def __init__(self, progress=False):
+        self.progress = progress
+        self.started = time.monotonic()
+        self.bytes = 0
+        self.types = Counter()
+        self.phases = defaultdict(float)
+        self.inputs = []
+        self._input = None  # [path, total bytes, bytes done, start time, objects before this input]
+        self._next_report = 0.0
+        self._lap = self.started
+        self._nested = 0.0  # phase() time since the last lap()
+
+    def begin_input(self, path, total):
+        self.inputs.append({"path": path, "source": "zip" if path.lower().endswith(".zip") else "xml",
+                            "bytes": total})
+        self._input = [path, total, 0, time.monotonic(), sum(self.types.values())]
+        self._next_report = self._input[3] + PROGRESS_INTERVAL
+
+    def advance(self, n):
+        self.bytes += n
+        if self._input is None:
+            return
+        self._input[2] += n
+        if self.progress:
+            now = time.monotonic()
+            if now >= self._next_report:
+                self._next_report = now + PROGRESS_INTERVAL
+                self.report(now)
+
+    def report(self, now=None):
+        path, total, done, start, objects_before = self._input
+        sec = max((now or time.monotonic()) - start, 1e-9)
+        pct = f" ({done / total:.1%})" if total else ""
+        rate = done / sec
+        eta = f", ETA {(total - done) / rate:.0f}s" if total and rate else ""
+        print(f"[progress] {os.path.basename(path)}: {done / 1e6:,.0f}/{total / 1e6:,.0f} MB{pct}, "
+              f"{rate / 1e6:.1f} MB/s, {(sum(self.types.values()) - objects_before) / sec:,.0f} objects/s{eta}", file=sys.stderr)
+
+    def end_input(self):
+        if self.progress and self._input is not None:
+            self.report()
+        self._input = None
+
+    @contextmanager
+    def phase(self, name):
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - t0
+            self.phases[name] += elapsed
+            self._nested += elapsed
+
+    def lap(self, name):
+        """Book the time since the previous lap() (minus nested phase() time) to phase `name`."""
+        now = time.monotonic()
+        self.phases[name] += now - self._lap - self._nested
+        self._lap, self._nested = now, 0.0
+
+    def count(self, objects):
+        """Pass (__type, props) pairs through, counting types (for objects not read by read_objects)."""
+        for t, props in objects:
+            self.types[t] += 1
+            yield t, props
+
+    def summary_line(self):
+        d = self.as_dict()
+        parts = [f"{d['objects']:,} objects"]
+        if d["bytes_per_s"]:
+            parts.append(f"{d['bytes_per_s'] / 1e6:.1f} MB/s")
+        if d["objects_per_s"]:
+            parts.append(f"{d['objects_per_s']:,} objects/s")
+        phases = ", ".join(f"{k} {v:.1f}s" for k, v in d["phases"].items())
+        return f"[stats] {', '.join(parts)}; {phases}; total {d['seconds']:.1f}s"
+
+    def timed(self, name, func):
+        """func wrapped so that its run time counts towards phase `name`."""
+        def wrapper(*a, **kw):
+            with self.phase(name):
+                return func(*a, **kw)
+        return wrapper
+
+    def as_dict(self):
+        parse_sec = sum(v for k, v in self.phases.items() if k.startswith("parse")) or None
+        objects = sum(self.types.values())
+        return {
+            "inputs": self.inputs,
+            "seconds": round(time.monotonic() - self.started, 3),
+            "phases": {k: round(v, 3) for k, v in self.phases.items()},
+            "bytes_parsed": self.bytes,
+            "bytes_per_s": round(self.bytes / parse_sec) if parse_sec else None,
+            "objects": objects,
+            "objects_per_s": round(objects / parse_sec) if parse_sec else None,
+            "types": dict(self.types.most_common()),
+            "peak_rss_mb": peak_rss_mb(),
+        }
+
+class ProgressReader:
+    """File-like wrapper that reports every read() to ParseStats.advance()."""
+
+    def __init__(self, f, stats):
+        self._f = f
+        self._stats = stats
+
+    def read(self, n=-1):
+        data = self._f.read(n)
+        self._stats.advance(len(data))
+        return data
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return round(rss / (1 << 20 if sys.platform == "darwin" else 1 << 10), 1)
+
+class PrefetchReader(io.RawIOBase):
+    """
+    Read-only stream that reads (and, for ZIPs, inflates) the next blocks of `raw` in a background
+    thread while the parser works on the current one.
+    """
+
+    def __init__(self, raw, block_size=READ_BUFFER_SIZE, depth=2):
+        self._raw = raw
+        self._block_size = block_size
+        self._blocks = queue.Queue(maxsize=depth)
+        self._buf = memoryview(b"")
+        self._eof = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._fill, daemon=True)
+        self._thread.start()
+
+    def _fill(self):
+        try:
+            while not self._stop.is_set():
+                block = self._raw.read(self._block_size)
+                self._blocks.put(block)
+                if not block:
+                    return
+        except BaseException as e:  # re-raised in the reading thread
+            self._blocks.put(e)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buf and not self._eof:
+            block = self._blocks.get()
+            if isinstance(block, BaseException):
+                raise block
+            if not block:
+                self._eof = True
+            self._buf = memoryview(block)
+        n = min(len(b), len(self._buf))
+        b[:n] = self._buf[:n]
+        self._buf = self._buf[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            while self._thread.is_alive():  # unblock a producer waiting on a full queue
+                try:
+                    self._blocks.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+            self._raw.close()
+        super().close()
+
+class ChunkReader(io.RawIOBase):
+    """
+    Bytes [start, end) of a file wrapped in a synthetic root element, so a run of complete
+    OBJECTs cut from onedb.xml parses as a document of its own.
+    """
+
+    def __init__(self, path, start, end, prefix=b"<CHUNK>", suffix=b"</CHUNK>"):
+        self._f = open(path, "rb")
+        self._f.seek(start)
+        self._left = end - start
+        self._prefix = prefix
+        self._suffix = suffix
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        if self._prefix:
+            data, self._prefix = self._prefix, b""
+        elif self._left > 0:
+            data = self._f.read(min(len(b), self._left))
+            if not data:
+                raise EOFError("onedb.xml changed while reading")
+            self._left -= len(data)
+        else:
+            data, self._suffix = self._suffix, b""
+        n = len(data)
+        b[:n] = data
+        return n
+
+    def close(self):
+        self._f.close()
+        super().close()
+
+def _find_forward(f, pos, pattern, limit):
+    """Offset of the first match of `pattern` at or after pos (searching up to limit), or None."""
+    overlap = 16
+    while pos < limit:
+        f.seek(pos)
+        block = f.read(min(READ_BUFFER_SIZE, limit - pos))
+        m = pattern.search(block)
+        if m:
+            return pos + m.start()
+        if len(block) <= overlap:
+            return None
+        pos += len(block) - overlap
+    return None
+
+def split_onedb(path, parts):
+    """
+    (xml_prefix, [(start, end), ...]) covering every OBJECT of a flat onedb.xml, cut right before
+    an <OBJECT tag; xml_prefix restates the document encoding for each chunk.
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        first = _find_forward(f, 0, OBJECT_START, size)
+        if first is None:
+            return b"", []
+        f.seek(0)
+        m = XML_ENCODING.search(f.read(min(first, 4096)))
+        prefix = b'<?xml version="1.0" encoding="%s"?>' % m.group(1) if m else b""
+        # Last OBJECT end: search backwards for the closing tag
+        end, pos = None, size
+        while end is None and pos > first:
+            lo = max(first, pos - READ_BUFFER_SIZE)
+            f.seek(lo)
+            i = f.read(pos - lo + 16).rfind(b"</OBJECT>")
+            if i >= 0:
+                end = lo + i + len(b"</OBJECT>")
+            pos = lo
+        if end is None:
+            return b"", []
+        cuts = [first]
+        for k in range(1, parts):
+            cut = _find_forward(f, first + (end - first) * k // parts, OBJECT_START, end)
+            if cut is not None and cut > cuts[-1]:
+                cuts.append(cut)
+    return prefix, list(zip(cuts, cuts[1:] + [end]))
+
+def parse_chunk(task):
+    """
+    Pool worker: parse one byte range and return ({__type: (shapes, rows)}, {__type: count}), where
+    shapes are the distinct property-name tuples and rows are (shape index, values tuple) in document
+    order; the counts include skipped types.
+    """
+    path, start, end, prefix, types = task
+    batches = {}
+    counts = Counter()
+    with ChunkReader(path, start, end, prefix + b"<CHUNK>") as f:
+        for t, props in iter_objects(io.BufferedReader(f, READ_BUFFER_SIZE), types, counts):
+            batch = batches.get(t)
+            if batch is None:
+                batch = batches[t] = ([], {}, [])
+            shapes, shape_ids, rows = batch
+            keys = tuple(props)
+            sid = shape_ids.get(keys)
+            if sid is None:
+                sid = shape_ids[keys] = len(shapes)
+                shapes.append(keys)
+            rows.append((sid, tuple(props.values())))
+    return {t: (shapes, rows) for t, (shapes, _ids, rows) in batches.items()}, counts
 
-def ensure_xml(path):
+def iter_objects_parallel(path, types=None, jobs=2, stats=None):
+    """
+    Same objects as iter_objects(path, types), parsed by `jobs` worker processes. Objects come
+    grouped per type within each chunk; the order among objects of one type is preserved.
+    """
+    prefix, ranges = split_onedb(path, jobs * CHUNKS_PER_JOB)
+    if stats is not None:
+        stats.begin_input(path, os.path.getsize(path))
+    tasks = iter([(path, start, end, prefix, types) for start, end in ranges])
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque((pool.submit(parse_chunk, task), task[2] - task[1])
+                        for _, task in zip(range(jobs * 2), tasks))
+        while pending:
+            future, size = pending.popleft()
+            batches, counts = future.result()
+            nxt = next(tasks, None)
+            if nxt is not None:
+                pending.append((pool.submit(parse_chunk, nxt), nxt[2] - nxt[1]))
+            if stats is not None:
+                stats.types.update(counts)
+                stats.advance(size)
+            for t, (shapes, rows) in batches.items():
+                for sid, values in rows:
+                    yield t, dict(zip(shapes[sid], values))
+
+@contextmanager
+def open_onedb(path, prefetch=False, stats=None):
+    """
+    Binary stream of onedb.xml, or of the first onedb.xml member of a ZIP, read in place
+    (nothing is extracted to disk). With `stats`, reads are reported to ParseStats.
+    """
     if path.lower().endswith(".zip"):
         with zipfile.ZipFile(path, "r") as zf:
             target = None
@@ -34,11 +447,242 @@ def ensure_xml(path):
                     break
             if not target:
                 raise FileNotFoundError("onedb.xml not found in ZIP")
-            outdir = Path(path).with_suffix("")
-            outdir.mkdir(parents=True, exist_ok=True)
-            zf.extract(target, outdir)
-            return str(outdir / target)
-    return path
+            raw = zf.open(target)
+            if stats is not None:
+                stats.begin_input(path, zf.getinfo(target).file_size)
+            with (PrefetchReader(raw) if prefetch else io.BufferedReader(raw, READ_BUFFER_SIZE)) as f:
+                yield f if stats is None else ProgressReader(f, stats)
+    else:
+        raw = open(path, "rb", buffering=0)
+        if stats is not None:
+            stats.begin_input(path, os.path.getsize(path))
+        with (PrefetchReader(raw) if prefetch else io.BufferedReader(raw, READ_BUFFER_SIZE)) as f:
+            yield f if stats is None else ProgressReader(f, stats)
+
+def read_objects(path, types=None, jobs=1, prefetch=False, stats=None):
+    """
+    (__type, props) for every object of onedb.xml or its ZIP, serially or with `jobs` workers;
+    `stats` (ParseStats) receives bytes read and per-__type counts.
+    """
+    counts = stats.types if stats is not None else None
+    if jobs > 1 and path.lower().endswith(".zip"):
+        print(f"[WARN] --jobs needs an uncompressed onedb.xml; parsing {path} serially", file=sys.stderr)
+        jobs = 1
+    if jobs > 1:
+        yield from iter_objects_parallel(path, types, jobs, stats)
+    else:
+        with open_onedb(path, prefetch, stats) as f:
+            yield from iter_objects(f, types, counts)
+    if stats is not None:
+        stats.end_input()
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(READ_BUFFER_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _quote_ident(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def open_object_cache(cache_path, input_path, types):
+    """
+    Read-only connection to a valid object cache for input_path holding at least `types`, or None.
+    A cache matches when size and mtime are unchanged, or when the size matches and the SHA-256 of
+    the input is the same.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        conn = sqlite3.connect(f"file:{cache_path}?mode=ro", uri=True)
+        meta = dict(conn.execute("SELECT key, value FROM meta"))
+    except sqlite3.Error:
+        return None
+    st = os.stat(input_path)
+    ok = (meta.get("version") == CACHE_VERSION
+          and set(json.loads(meta.get("types", "[]"))) >= types
+          and meta.get("size") == str(st.st_size)
+          and (meta.get("mtime_ns") == str(st.st_mtime_ns) or meta.get("sha256") == file_sha256(input_path)))
+    if not ok:
+        conn.close()
+        return None
+    return conn
+
+def iter_cached_objects(conn, columns_by_type):
+    """
+    Yield (__type, props) from the object cache, reading only the listed types and columns
+    (grouped per type, in document order within a type). Missing properties are left out of props,
+    properties without VALUE come back as None.
+    """
+    tables = dict(conn.execute("SELECT type, tbl FROM types"))
+    for t, wanted in columns_by_type.items():
+        tbl = tables.get(t)
+        if tbl is None:
+            continue
+        have = {row[1] for row in conn.execute(f"PRAGMA table_info({_quote_ident(tbl)})")}
+        cols = [c for c in wanted if c in have]
+        if not cols:
+            continue
+        sql = f"SELECT {', '.join(map(_quote_ident, cols))} FROM {_quote_ident(tbl)} ORDER BY rowid"
+        for row in conn.execute(sql):
+            yield t, {c: (None if v == CACHE_NO_VALUE else v) for c, v in zip(cols, row) if v is not None}
+
+class ObjectCacheWriter:
+    """
+    Writes parsed objects into an SQLite object cache: one table per object type, one column per
+    property. The cache is built in a temporary file and only renamed into place by finish(), so an
+    interrupted run never leaves a cache that looks valid. The input is hashed in a background thread
+    while parsing.
+    """
+
+    def __init__(self, cache_path, input_path):
+        self.cache_path = cache_path
+        self.input_path = input_path
+        self.tmp_path = cache_path + ".tmp"
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+        self.conn = sqlite3.connect(self.tmp_path)
+        try:
+            self.conn.execute("PRAGMA journal_mode=OFF")
+            self.conn.execute("PRAGMA synchronous=OFF")
+            self.conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+            self.conn.execute("CREATE TABLE types (type TEXT PRIMARY KEY, tbl TEXT)")
+        except sqlite3.Error:
+            self.abort()
+            raise
+        self.columns = {}   # type → [property names]
+        self.col_index = {} # type → {property name: position}
+        self.rows = {}      # type → pending row tuples
+        self.sha256 = None
+        self._hasher = threading.Thread(target=self._hash, daemon=True)
+        self._hasher.start()
+
+    def _hash(self):
+        self.sha256 = file_sha256(self.input_path)
+
+    def _flush(self, t):
+        rows = self.rows[t]
+        if rows:
+            cols = self.columns[t]
+            sql = (f"INSERT INTO {_quote_ident('t' + t)} ({', '.join(map(_quote_ident, cols))}) "
+                   f"VALUES ({', '.join('?' * len(cols))})")
+            width = len(cols)
+            self.conn.executemany(sql, (r + (None,) * (width - len(r)) for r in rows))
+            rows.clear()
+
+    def add(self, t, props):
+        cols = self.columns.get(t)
+        if cols is None:
+            cols = self.columns[t] = list(props)
+            self.col_index[t] = {c: i for i, c in enumerate(cols)}
+            self.rows[t] = []
+            self.conn.execute("INSERT INTO types VALUES (?, ?)", (t, "t" + t))
+            self.conn.execute(f"CREATE TABLE {_quote_ident('t' + t)} ({', '.join(map(_quote_ident, cols))})")
+        index = self.col_index[t]
+        new = [k for k in props if k not in index]
+        if new:
+            self._flush(t)
+            for k in new:
+                index[k] = len(cols)
+                cols.append(k)
+                self.conn.execute(f"ALTER TABLE {_quote_ident('t' + t)} ADD COLUMN {_quote_ident(k)}")
+        row = [None] * len(cols)
+        for k, v in props.items():
+            row[index[k]] = CACHE_NO_VALUE if v is None else v
+        rows = self.rows[t]
+        rows.append(tuple(row))
+        if len(rows) >= CACHE_BATCH:
+            self._flush(t)
+
+    @property
+    def active(self):
+        return self.conn is not None
+
+    def tee(self, objects):
+        """
+        Pass (__type, props) pairs through, writing each into the cache. A failing cache write
+        (disk full, too many columns) only disables the cache; a failing parse drops the partial cache.
+        """
+        try:
+            for t, props in objects:
+                if t and self.conn is not None:
+                    try:
+                        self.add(t, props)
+                    except (OSError, sqlite3.Error) as e:
+                        self.abort()
+                        print(f"[WARN] object cache disabled: {e}", file=sys.stderr)
+                yield t, props
+        except BaseException:
+            self.abort()
+            raise
+
+    def finish(self, types):
+        for t in self.rows:
+            self._flush(t)
+        self._hasher.join()
+        st = os.stat(self.input_path)
+        self.conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+            ("version", CACHE_VERSION), ("size", str(st.st_size)), ("mtime_ns", str(st.st_mtime_ns)),
+            ("sha256", self.sha256), ("types", json.dumps(sorted(types))),
+        ])
+        self.conn.commit()
+        self.conn.close()
+        os.replace(self.tmp_path, self.cache_path)
+
+    def abort(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+def parse_only(text):
+    """'dns', 'dhcp,zone_forwarder', '.com.infoblox.dns.network' → set of full __type names"""
+    types = set()
+    for item in text.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        if item in ONLY_GROUPS:
+            types |= ONLY_GROUPS[item]
+        elif item in USED_TYPES:
+            types.add(item)
+        elif ".com.infoblox.dns." + item in USED_TYPES:
+            types.add(".com.infoblox.dns." + item)
+        else:
+            raise ValueError(f"unknown object type: {item}")
+    if not types:
+        raise ValueError("no object types selected")
+    return types
+
+def expand_only(types):
+    """
+    Add the types that the CSVs of an --only selection are built from (see ONLY_REQUIRES).
+    Returns (types, added); ValueError if the selection would not write any CSV.
+    """
+    added = set()
+    for t in types:
+        added |= ONLY_REQUIRES.get(t, set())
+    added -= types
+    if not (types | added) & CSV_TYPES:
+        names = ", ".join(sorted(t.rsplit(".", 1)[-1] for t in types))
+        raise ValueError(f"{names}: no CSV of its own (options only appear in options_json of networks "
+                         "and ranges); add network or dhcp_range, or use --diff")
+    return types | added, added
+
+def option_parent_key(parent):
+    """
+    '.com.infoblox.dns.network$10.0.0.0/24/0' → ('network', '10.0.0.0/24', '0'),
+    '.com.infoblox.dns.dhcp_range$10.0.0.10-10.0.0.99/0' → ('dhcp_range', '10.0.0.10-10.0.0.99', '0');
+    None for parents that are not networks or ranges.
+    """
+    type_part, sep, rest = (parent or "").partition("$")
+    kind = OPTION_PARENT_KINDS.get(type_part)
+    if kind is None or not sep:
+        return None
+    address, _, view = rest.rpartition("/")
+    return (kind, address, view)
 
 def parse_option_def_key(s):
     # Parse strings like 'DHCP..false.33' -> (space, is_ipv6, code). Fallback: trailing digits as code.
@@ -80,6 +724,88 @@ def write_csv(path: Path, fieldnames, rows):
             w.writerow({k: r.get(k, "") for k in fieldnames})
     return path
 
+def snapshot_hashes(path, types, jobs=1, prefetch=False, stats=None):
+    """
+    {__type: {key: digest}} for one backup: the DIFF_KEYS values joined by '|' as key and a 16-byte
+    BLAKE2b of all properties as digest. Only these maps are kept, never the objects.
+    """
+    maps = {t: {} for t in types}
+    for t, props in read_objects(path, types, jobs, prefetch, stats):
+        fields = DIFF_KEYS.get(t)
+        if fields is None:
+            continue
+        key = "|".join(props.get(f) or "" for f in fields)
+        digest = hashlib.blake2b(json.dumps(props, sort_keys=True, ensure_ascii=False).encode("utf-8"),
+                                 digest_size=16).digest()
+        seen = maps[t].get(key)
+        if seen is not None:  # duplicate key: both objects count towards one entry
+            digest = hashlib.blake2b(seen + digest, digest_size=16).digest()
+        maps[t][key] = digest
+    return maps
+
+def snapshot_diff(before_path, after_path, outdir, types, jobs=1, prefetch=False, stats=None):
+    """
+    Write snapshot_diff.csv (one row per added/removed/changed object) and snapshot_diff_summary.csv
+    (counts per type) for two backups, and print the summary as JSON.
+    """
+    types = types & set(DIFF_KEYS)
+    before = snapshot_hashes(before_path, types, jobs, prefetch, stats)
+    if stats is not None:
+        stats.lap("parse_before")
+    after = snapshot_hashes(after_path, types, jobs, prefetch, stats)
+    if stats is not None:
+        stats.lap("parse_after")
+    rows = []
+    summary = []
+    for t in sorted(types):
+        short = t.rsplit(".", 1)[-1]
+        old, new = before.pop(t), after.pop(t)
+        added = removed = changed = unchanged = 0
+        changes = []
+        for key, digest in new.items():
+            prev = old.pop(key, None)
+            if prev is None:
+                changes.append((key, "added"))
+                added += 1
+            elif prev != digest:
+                changes.append((key, "changed"))
+                changed += 1
+            else:
+                unchanged += 1
+        for key in old:
+            changes.append((key, "removed"))
+            removed += 1
+        del old, new
+        changes.sort()
+        rows.extend({"object_type": short, "key": key, "change": change} for key, change in changes)
+        summary.append({"object_type": short, "added": added, "removed": removed,
+                        "changed": changed, "unchanged": unchanged})
+
+    if stats is not None:
+        stats.lap("compare")
+    write_csv(outdir / "snapshot_diff.csv", ["object_type","key","change"], rows)
+    write_csv(outdir / "snapshot_diff_summary.csv",
+              ["object_type","added","removed","changed","unchanged"], summary)
+    if stats is not None:
+        stats.lap("write")
+    print(json.dumps({
+        "before": before_path,
+        "after": after_path,
+        "types": {r["object_type"]: {k: r[k] for k in ("added","removed","changed","unchanged")} for r in summary},
+        "outdir": str(outdir),
+        "peak_rss_mb": peak_rss_mb(),
+    }, indent=2))
+
+def finish_stats(stats, path):
+    if stats is None:
+        return
+    if stats.progress:
+        print(stats.summary_line(), file=sys.stderr)
+    if path:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(stats.as_dict(), f, indent=2)
+            f.write("\n")
+
 def main():
     ap = argparse.ArgumentParser(description="Generate DNS/DHCP overview from Infoblox onedb.xml")
     ap.add_argument("input", help="Path to onedb.xml or onedb.xml.zip")
@@ -87,12 +813,50 @@ def main():
     ap.add_argument("--filter-view", help="Only include zones (and forwarders) from this DNS view name")
     ap.add_argument("--split-views", action="store_true", help="Emit per-view zone CSVs")
     ap.add_argument("--no-sorted-by-view", action="store_true", help="Skip generating zones_overview_by_view.csv")
+    ap.add_argument("--prefetch", action="store_true",
+                    help="Read (and unzip) the next input block in a background thread while parsing")
+    ap.add_argument("--jobs", type=int, default=1, metavar="N",
+                    help="Parse a plain onedb.xml in N worker processes (default: 1; 0 = all CPU cores)")
+    ap.add_argument("--only", metavar="TYPES",
+                    help="Parse only these object types: dns, dhcp and/or type names (e.g. zone,zone_forwarder), "
+                         "comma-separated; CSVs of skipped types are not written")
+    ap.add_argument("--diff", metavar="AFTER",
+                    help="Compare input (before) with a second onedb.xml or ZIP (after) and write "
+                         "snapshot_diff*.csv instead of the overview")
+    ap.add_argument("--progress", action="store_true",
+                    help=f"Print parse progress (MB, MB/s, objects/s, ETA) to stderr every {PROGRESS_INTERVAL:g}s "
+                         "and a phase summary at the end")
+    ap.add_argument("--stats", metavar="FILE",
+                    help="Write run statistics (throughput, per-__type counts, phase timings) as JSON")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"Neither read nor write the object cache (<input>{CACHE_SUFFIX})")
+    ap.add_argument("--cache-file", help=f"Object cache location (default: <input>{CACHE_SUFFIX})")
     args = ap.parse_args()
+    if args.jobs < 0:
+        ap.error("--jobs must be >= 0")
+    jobs = args.jobs or os.cpu_count() or 1
+    try:
+        types = parse_only(args.only) if args.only else set(USED_TYPES)
+    except ValueError as e:
+        ap.error(f"--only: {e}")
+    stats = ParseStats(args.progress) if args.progress or args.stats else None
 
-    xml_path = ensure_xml(args.input)
     outdir = Path(args.outdir)
     outdir.mkdir(parents=True, exist_ok=True)
 
+    if args.diff:
+        snapshot_diff(args.input, args.diff, outdir, types, jobs, args.prefetch, stats)
+        finish_stats(stats, args.stats)
+        return
+
+    try:
+        types, added = expand_only(types)
+    except ValueError as e:
+        ap.error(f"--only: {e}")
+    if added:
+        print(f"[only] also parsing {', '.join(sorted(t.rsplit('.', 1)[-1] for t in added))} "
+              "(needed by the selected CSVs)", file=sys.stderr)
+
     zones = []
     zone_props_map = {}
     forwarders_by_zone = defaultdict(list)
@@ -104,19 +868,41 @@ def main():
     reservations = []
     options_by_parent = defaultdict(list)
 
+    # Single pass: option definitions may follow the options that use them, so options are
+    # buffered as compact tuples and their names resolved once the scan is complete.
     option_defs = {}
-    for t, props in iter_objects(xml_path):
+    pending_options = []   # (parent key, (space, is_v6, code), value, is_ipv4)
+    parent_keys = {}       # parent string → option_parent_key()
+    option_keys = {}       # option_definition string → (space, is_v6, code)
+    cache_path = args.cache_file or args.input + CACHE_SUFFIX
+    cache_conn = cache_writer = None
+    if not args.no_cache:
+        cache_conn = open_object_cache(cache_path, args.input, types)
+    if cache_conn is not None:
+        print(f"[cache] loading objects from {cache_path}", file=sys.stderr)
+        objects = iter_cached_objects(cache_conn, {t: USED_PROPERTIES[t] for t in USED_PROPERTIES if t in types})
+        if stats is not None:
+            stats.inputs.append({"path": cache_path, "source": "cache"})
+            objects = stats.count(objects)
+    else:
+        objects = read_objects(args.input, types, jobs, args.prefetch, stats)
+        if not args.no_cache:
+            try:
+                cache_writer = ObjectCacheWriter(cache_path, args.input)
+                objects = cache_writer.tee(objects)
+            except (OSError, sqlite3.Error) as e:
+                print(f"[WARN] object cache disabled: {e}", file=sys.stderr)
+
+    for t, props in objects:
+        if not t:
+            continue
         if t == ".com.infoblox.dns.option_definition":
             name = props.get("name","")
             code = props.get("code","")
             space = props.get("option_space","") or "DHCP"
             is_v6 = (props.get("is_ipv6","false").lower() == "true") if "is_ipv6" in props else False
             option_defs[(space, is_v6, code)] = name
-
-    for t, props in iter_objects(xml_path):
-        if not t:
-            continue
-        if t == ".com.infoblox.dns.zone":
+        elif t == ".com.infoblox.dns.zone":
             zones.append(props)
         elif t == ".com.infoblox.dns.zone_properties":
             zid = props.get("zone") or props.get("parent")
@@ -149,17 +935,52 @@ def main():
             reservations.append(props)
         elif t == ".com.infoblox.dns.option":
             parent = props.get("parent")
+            key = parent_keys.get(parent)
+            if key is None:
+                key = parent_keys[parent] = option_parent_key(parent) or ()
+            if not key:
+                continue  # options of other parents never reach a CSV
             od = props.get("option_definition","")
-            space, is_v6, code = parse_option_def_key(od)
-            name = option_defs.get((space or "DHCP", bool(is_v6), code or ""), "")
-            options_by_parent[parent].append({
-                "space": space or "",
-                "code": code or "",
-                "name": name,
-                "value": props.get("value",""),
-                "is_ipv4": props.get("is_ipv4",""),
-            })
+            okey = option_keys.get(od)
+            if okey is None:
+                space, is_v6, code = parse_option_def_key(od)
+                okey = option_keys[od] = (space or "", bool(is_v6), code or "")
+            pending_options.append((key, okey, props.get("value",""), props.get("is_ipv4","")))
+    del parent_keys
+    if stats is not None:
+        stats.lap("parse")
+
+    # options_by_parent holds each option as its options_json fragment; the name and the JSON prefix
+    # are resolved once per option definition key
+    to_json = json.JSONEncoder(ensure_ascii=False).encode
+    option_prefix = {}
+    for key, okey, value, is_ipv4 in pending_options:
+        prefix = option_prefix.get(okey)
+        if prefix is None:
+            space, is_v6, code = okey
+            name = option_defs.get((space or "DHCP", is_v6, code), "")
+            prefix = option_prefix[okey] = (
+                f'{{"space": {to_json(space)}, "code": {to_json(code)}, "name": {to_json(name)}, "value": ')
+        options_by_parent[key].append(f'{prefix}{to_json(value)}, "is_ipv4": {to_json(is_ipv4)}}}')
+    del pending_options
+    if stats is not None:
+        stats.lap("join")
+
+    if cache_conn is not None:
+        cache_conn.close()
+    if cache_writer is not None and cache_writer.active:
+        try:
+            cache_writer.finish(types)
+            print(f"[cache] objects written to {cache_path}", file=sys.stderr)
+        except (OSError, sqlite3.Error) as e:
+            cache_writer.abort()
+            print(f"[WARN] object cache not written: {e}", file=sys.stderr)
+        if stats is not None:
+            stats.lap("cache_write")
 
+    # Row building below counts as "join", CSV output as "write"
+    write = stats.timed("write", write_csv) if stats is not None else write_csv
+    want_zones = ".com.infoblox.dns.zone" in types
     zone_rows = []
     for z in zones:
         zr = {}
@@ -197,19 +1018,20 @@ def main():
         "forwarder_count","forwarders_only","use_override_forwarders",
         "ad_dns_servers","zone_internal","dns_view"
     ]
-    write_csv(outdir / "zones_overview.csv", zone_fields, zone_rows)
+    if want_zones:
+        write(outdir / "zones_overview.csv", zone_fields, zone_rows)
 
-    if not args.no_sorted_by_view:
+    if want_zones and not args.no_sorted_by_view:
         zone_rows_sorted = sorted(zone_rows, key=lambda r: (r.get("dns_view",""), r.get("zone_fqdn","")))
-        write_csv(outdir / "zones_overview_by_view.csv", zone_fields, zone_rows_sorted)
+        write(outdir / "zones_overview_by_view.csv", zone_fields, zone_rows_sorted)
 
-    if args.split_views:
+    if want_zones and args.split_views:
         by_view = defaultdict(list)
         for r in zone_rows:
             by_view[r.get("dns_view","")].append(r)
         for view, rows in by_view.items():
             safe_view = (view or "no_view").replace("/", "_").replace("\\", "_")
-            write_csv(outdir / f"zones_overview_view_{safe_view}.csv", zone_fields, rows)
+            write(outdir / f"zones_overview_view_{safe_view}.csv", zone_fields, rows)
 
     fwd_rows = []
     for z in zones:
@@ -228,7 +1050,8 @@ def main():
             }
             fwd_rows.append(f)
     fwd_fields = ["zone_fqdn","dns_view","position","forwarder_ip","forwarder_name","zone_internal"]
-    write_csv(outdir / "zone_forwarders.csv", fwd_fields, fwd_rows)
+    if want_zones:
+        write(outdir / "zone_forwarders.csv", fwd_fields, fwd_rows)
 
     zff_rows = []
     for z in zones:
@@ -246,7 +1069,7 @@ def main():
                 "use_override_forwarders": flags.get("use_override_forwarders",""),
             })
     if zff_rows:
-        write_csv(outdir / "zone_forwarding_flags.csv", ["zone_fqdn","dns_view","zone_internal","forwarders_only","use_override_forwarders"], zff_rows)
+        write(outdir / "zone_forwarding_flags.csv", ["zone_fqdn","dns_view","zone_internal","forwarders_only","use_override_forwarders"], zff_rows)
 
     net_fields = [
         "network","cidr","is_ipv4","disabled","authoritative","lease_time","comment",
@@ -256,7 +1079,7 @@ def main():
     ]
     net_rows = []
     for n in networks:
-        parent_id = f".com.infoblox.dns.network${n.get('address','')}/{n.get('cidr','')}/{n.get('network_view','0')}"
+        parent_key = ("network", f"{n.get('address','')}/{n.get('cidr','')}", n.get("network_view","0"))
         row = {
             "network": f"{n.get('address','')}/{n.get('cidr','')}",
             "cidr": n.get("cidr",""),
@@ -280,10 +1103,11 @@ def main():
             "next_server": n.get("next_server",""),
             "boot_server": n.get("boot_server",""),
             "boot_file": n.get("boot_file",""),
-            "options_json": json.dumps(options_by_parent.get(parent_id, []), ensure_ascii=False),
+            "options_json": "[" + ", ".join(options_by_parent.get(parent_key, ())) + "]",
         }
         net_rows.append(row)
-    write_csv(outdir / "dhcp_networks.csv", net_fields, net_rows)
+    if ".com.infoblox.dns.network" in types:
+        write(outdir / "dhcp_networks.csv", net_fields, net_rows)
 
     range_fields = [
         "network","start_address","end_address","is_ipv4","disabled","member","lease_time","comment",
@@ -292,7 +1116,7 @@ def main():
     ]
     range_rows = []
     for r in ranges:
-        parent_id = f".com.infoblox.dns.dhcp_range${r.get('start_address','')}-{r.get('end_address','')}/{r.get('network_view','0')}"
+        parent_key = ("dhcp_range", f"{r.get('start_address','')}-{r.get('end_address','')}", r.get("network_view","0"))
         row = {
             "network": r.get("network",""),
             "start_address": r.get("start_address",""),
@@ -308,10 +1132,11 @@ def main():
             "next_server": r.get("next_server",""),
             "boot_server": r.get("boot_server",""),
             "boot_file": r.get("boot_file",""),
-            "options_json": json.dumps(options_by_parent.get(parent_id, []), ensure_ascii=False),
+            "options_json": "[" + ", ".join(options_by_parent.get(parent_key, ())) + "]",
         }
         range_rows.append(row)
-    write_csv(outdir / "dhcp_ranges.csv", range_fields, range_rows)
+    if ".com.infoblox.dns.dhcp_range" in types:
+        write(outdir / "dhcp_ranges.csv", range_fields, range_rows)
 
     res_fields = ["ip","mac","name","domain_name","network","network_view","lease_time","comment"]
     res_rows = []
@@ -326,13 +1151,15 @@ def main():
             "lease_time": h.get("lease_time",""),
             "comment": h.get("comment",""),
         })
-    write_csv(outdir / "dhcp_reservations.csv", res_fields, res_rows)
+    if ".com.infoblox.dns.fixed_address" in types:
+        write(outdir / "dhcp_reservations.csv", res_fields, res_rows)
 
     counts = defaultdict(int)
     for r in zone_rows:
         counts[(r.get("dns_view",""), r.get("zone_type",""))] += 1
     summary_rows = [{"dns_view": k[0], "zone_type": k[1], "count": v} for k,v in counts.items()]
-    write_csv(outdir / "zones_by_view_summary.csv", ["dns_view","zone_type","count"], summary_rows)
+    if want_zones:
+        write(outdir / "zones_by_view_summary.csv", ["dns_view","zone_type","count"], summary_rows)
 
     print(json.dumps({
         "zones": len(zone_rows),
@@ -341,7 +1168,11 @@ def main():
         "dhcp_ranges": len(ranges),
         "dhcp_reservations": len(reservations),
         "outdir": str(outdir),
+        "peak_rss_mb": peak_rss_mb(),
     }, indent=2))
+    if stats is not None:
+        stats.lap("join")
+    finish_stats(stats, args.stats)
 
 if __name__ == "__main__":
     main()
@@ -7,27 +7,108 @@
 
 import argparse
 import json
+import os
 from pathlib import Path
 import pandas as pd
 import ipaddress
-
-def read_csv_safe(path: Path) -> pd.DataFrame:
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import pyarrow  # noqa: F401  (optional, faster multi-threaded CSV engine)
+    CSV_ENGINE = "pyarrow"
+except ImportError:
+    CSV_ENGINE = "c"
+
+LOAD_THREADS = 4
+
+# Columns read per QEF: None = all (file is written as-is), () = row count only
+QEF_COLUMNS = {
+    "domain.qef":               ("domn_id","domn_name","status_flag","reversed_name","org_id"),
+    "reverse_zones.qef":        ("zone_id","name","status_flag","reversed_name","zone_addr1","zone_addr2","zone_addr3","zone_addr4",
+                                 "mask_length","prefix_length","start_addr","end_addr"),
+    "dns_view.qef":             ("dns_view_id","name","org_id","site_id","match_clients","match_destinations","match_recursive_only"),
+    "dns_view_zone.qef":        ("dns_view_zone_id","dns_view_id","zone_id","zone_type","name","reversed_name","refresh_time",
+                                 "retry_time","expire_time","min_time","neg_cache_ttl","use_global_options"),
+    "zone_servers.qef":         ("zone_id","dns_svr_id","status_flag","root_zone","send_securednsupdates","zone_select_flag"),
+    "dns_view_zone_server.qef": (),
+    "networks.qef":             None,
+    "subnet.qef":               ("subnet_id","subnet_name","subnet_addr1","subnet_addr2","subnet_addr3","subnet_addr4","mask_length",
+                                 "subnet_mask1","subnet_mask2","subnet_mask3","subnet_mask4","domn_id","org_id","status_flag"),
+    "v6subnet.qef":             None,
+    "managed_range.qef":        None,
+    "dhcp_ext.qef":             ("obj_id","subnet_id","ip_address","full_addr_str","mac_addr","client_id","client_vendor_class",
+                                 "lease_granted","lease_expires","manual_flag"),
+    "object_ranges.qef":        ("obj_range_id","subnet_id","first_address","last_address"),
+    "obj_prof.qef":             ("obj_id","subnet_id","alloc_type_cd","obj_ip_addr1","obj_ip_addr2","obj_ip_addr3","obj_ip_addr4"),
+    "srvrs.qef":                ("server_id","server_name","type_code"),
+    "object_interface.qef":     ("obj_id","full_addr_str"),
+}
+
+def _read_csv(path: Path, usecols=None) -> pd.DataFrame:
+    if CSV_ENGINE == "pyarrow":
+        try:
+            return pd.read_csv(path, dtype=str, usecols=usecols, engine="pyarrow")
+        except Exception as e:
+            # The C engine is more lenient with malformed rows
+            print(f"[WARN] pyarrow could not read {path} ({type(e).__name__}: {e}); retrying with the C engine")
+    return pd.read_csv(path, dtype=str, usecols=usecols, low_memory=False)
+
+def read_csv_safe(path: Path, columns=None) -> pd.DataFrame:
+    """
+    Read a QEF as strings. With `columns`, only those present in the header are loaded
+    (at least the first column, so row counts stay correct).
+    """
     if not path or not path.exists():
         return pd.DataFrame()
     try:
-        return pd.read_csv(path, dtype=str, low_memory=False)
+        usecols = None
+        if columns is not None:
+            header = list(pd.read_csv(path, dtype=str, nrows=0).columns)
+            usecols = [c for c in header if c in columns] or header[:1]
+        return _read_csv(path, usecols)
     except Exception as e:
         print(f"[WARN] Failed to read {path}: {e}")
         return pd.DataFrame()
 
-def find_ci(root: Path, basename: str) -> Path | None:
-    p = root / basename
-    if p.exists():
-        return p
-    for f in root.rglob("*"):
-        if f.is_file() and f.name.lower() == basename.lower():
-            return f
-    return None
+def load_qefs(qef, names, threads: int = LOAD_THREADS) -> dict:
+    """
+    Load several QEFs concurrently, each restricted to its QEF_COLUMNS.
+    """
+    def _load(name):
+        return read_csv_safe(qef.find(name), QEF_COLUMNS.get(name))
+    with ThreadPoolExecutor(max_workers=max(1, threads)) as pool:
+        return dict(zip(names, pool.map(_load, names)))
+
+class QefIndex:
+    """
+    Case-insensitive file name → path index of an export directory, built with a single walk.
+    An exact-case file directly in the root wins; otherwise the shallowest match (then by path)
+    is used, and a name with several matches is reported once.
+    """
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.by_name: dict[str, list[Path]] = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            base = Path(dirpath)
+            for name in sorted(filenames):
+                self.by_name.setdefault(name.lower(), []).append(base / name)
+        self._reported: set[str] = set()
+
+    def find(self, basename: str) -> Path | None:
+        matches = self.by_name.get(basename.lower())
+        if not matches:
+            return None
+        exact = self.root / basename
+        if exact in matches:
+            return exact
+        matches = sorted(matches, key=lambda p: (len(p.parts), str(p)))
+        if len(matches) > 1 and basename.lower() not in self._reported:
+            self._reported.add(basename.lower())
+            others = ", ".join(str(p) for p in matches[1:])
+            print(f"[WARN] {basename}: {len(matches)} matches, using {matches[0]} (ignored: {others})")
+        return matches[0]
 
 def write_csv(df: pd.DataFrame, out_dir: Path, prefix: str, stem: str):
     if df is None or df.empty:
@@ -72,31 +153,32 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("qef_dir", help="Directory with QEF files")
     ap.add_argument("--out", default="qip_overview_out", help="Output directory")
+    ap.add_argument("--threads", type=int, default=LOAD_THREADS, metavar="N",
+                    help=f"QEF files loaded concurrently (default: {LOAD_THREADS})")
     args = ap.parse_args()
 
     src = Path(args.qef_dir)
     out = Path(args.out)
     out.mkdir(parents=True, exist_ok=True)
     prefix = src.name.rstrip("/")
+    qef = QefIndex(src)
 
     # Load core dataframes
-    dom           = read_csv_safe(find_ci(src, "domain.qef"))
-    rev           = read_csv_safe(find_ci(src, "reverse_zones.qef"))
-    dns_view      = read_csv_safe(find_ci(src, "dns_view.qef"))
-    dns_view_zone = read_csv_safe(find_ci(src, "dns_view_zone.qef"))
-    zsrvr         = read_csv_safe(find_ci(src, "zone_servers.qef"))
-    dns_vzs       = read_csv_safe(find_ci(src, "dns_view_zone_server.qef"))
-    networks      = read_csv_safe(find_ci(src, "networks.qef"))
-    sub4          = read_csv_safe(find_ci(src, "subnet.qef"))
-    sub6          = read_csv_safe(find_ci(src, "v6subnet.qef"))
-    ranges        = read_csv_safe(find_ci(src, "managed_range.qef"))
-    dhcp_ext      = read_csv_safe(find_ci(src, "dhcp_ext.qef"))
-    obj_ranges    = read_csv_safe(find_ci(src, "object_ranges.qef"))
-    obj_prof      = read_csv_safe(find_ci(src, "obj_prof.qef"))
-    sdom          = read_csv_safe(find_ci(src, "subnet_domns.qef"))
-    dom_uda       = read_csv_safe(find_ci(src, "domain_uda.qef"))
-    sub_uda       = read_csv_safe(find_ci(src, "subnet_uda.qef"))
-    srvrs         = read_csv_safe(find_ci(src, "srvrs.qef"))
+    data = load_qefs(qef, [n for n in QEF_COLUMNS if n != "object_interface.qef"], args.threads)
+    dom           = data["domain.qef"]
+    rev           = data["reverse_zones.qef"]
+    dns_view      = data["dns_view.qef"]
+    dns_view_zone = data["dns_view_zone.qef"]
+    zsrvr         = data["zone_servers.qef"]
+    dns_vzs       = data["dns_view_zone_server.qef"]
+    networks      = data["networks.qef"]
+    sub4          = data["subnet.qef"]
+    sub6          = data["v6subnet.qef"]
+    ranges        = data["managed_range.qef"]
+    dhcp_ext      = data["dhcp_ext.qef"]
+    obj_ranges    = data["object_ranges.qef"]
+    obj_prof      = data["obj_prof.qef"]
+    srvrs         = data["srvrs.qef"]
 
     # Zones
     fwd = pd.DataFrame()
@@ -251,7 +333,7 @@ def main():
             has_no_lease = (~de.get("lease_granted", pd.Series([None]*len(de))).notna()) & (~de.get("lease_expires", pd.Series([None]*len(de))).notna())
             has_identity = de.get("mac_addr", pd.Series([""]*len(de))).fillna("") != ""
             de = de[(de["manual_flag_int"] == 1) | (has_no_lease & has_identity)].copy()
-            oi = read_csv_safe(find_ci(src, "object_interface.qef"))
+            oi = read_csv_safe(qef.find("object_interface.qef"), QEF_COLUMNS["object_interface.qef"])
             if not oi.empty and {"obj_id","full_addr_str"}.issubset(set(oi.columns)):
                 de = de.merge(oi[["obj_id","full_addr_str"]], on="obj_id", how="left").rename(columns={"full_addr_str":"ip_address"})
             dhcp_res = de[[c for c in ["obj_id","ip_address","subnet_id","mac_addr","client_id","client_vendor_class","lease_granted","lease_expires","manual_flag"] if c in de.columns]].drop_duplicates()
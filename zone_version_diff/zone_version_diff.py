@@ -7,15 +7,40 @@
 # A global flag excludes “\_msdcs.\*” zones by default. Results go to a fixed report directory: a full
 # file list, a unique lowercase zone list, per-zone “only-in” files for each version pair, per-zone
 # pairwise-summary CSVs, and a global pairwise-summary CSV.
-
+# With --jobs N, version files are parsed in a process pool; output order stays deterministic.
+# Parsed record sets are cached (compressed) under the report directory, keyed by path, size, mtime, content hash,
+# origin and IGNORE_TYPES, so reruns only parse new or changed versions (--no-cache disables this).
+# Canonical files (one absolute record per line) are read by a streaming line parser; only lines it cannot
+# reproduce exactly go through dnspython, and whole files fall back to dnspython on anything unusual.
+# Records of all versions of a zone are interned once (IDs in sorted record order) and each version is a bitmap
+# over those IDs, so pairwise diffs are big-integer AND/NOT operations instead of string set algebra.
+# --mode picks which version pairs get only-in files (all pairs, consecutive versions, or against a baseline);
+# a per-record presence matrix gives every pairwise count in one pass, written as a per-zone count matrix.
+# --timeline writes one row per distinct record with first/last version seen and the versions it was missing in.
+# --external-sort sorts each version to a temporary file in bounded memory (spilling sorted runs) and diffs by
+# merging the sorted files, for zones too large to hold in RAM.
+
+
+from __future__ import annotations
 
 import argparse
 import csv
 import glob
+import hashlib
+import heapq
+import json
 import os
+import re
+import shutil
 import sys
-from itertools import combinations
-from collections import defaultdict
+import tempfile
+import zlib
+from array import array
+from collections.abc import Iterable
+from itertools import combinations, repeat
+from operator import itemgetter
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
 
 # =========================
 # Global configuration
@@ -23,6 +48,7 @@ from collections import defaultdict
 GLOB_PATTERN = "*_*_canon*"                    # e.g., db.example.com_1_canon
 IGNORE_TYPES = {"SOA"}                         # add "RRSIG" if DNSSEC sigs are noise
 EXCLUDE_MSDCS = True                           # exclude zones like _msdcs.example.com
+FAST_CANON_PARSER = True                       # line parser for canonical files; False = always full dnspython
 
 # Directory constants
 OUTPUT_DIR_NAME = "dns_diff_report"
@@ -34,9 +60,15 @@ ZONELIST_NAME = "zonelist.txt"                 # unique list of zones (lowercase
 GLOBAL_SUMMARY_NAME = "GLOBAL_pairwise_summary.csv"
 ERRORS_NAME = "errors.txt"
 NOTE_NAME = "note.txt"
+CACHE_DIR_NAME = ".parse_cache"                # parsed record sets, inside OUTPUT_DIR_NAME
+CACHE_MAGIC = b"ZVDCACHE1\n"                   # bump when the parsed representation changes
+SORT_BUFFER_MB = 256                           # --external-sort: in-memory buffer per worker before spilling a run
+SORT_MERGE_FAN_IN = 256                        # --external-sort: max run files open at once per merge
 
 # Per-zone file name templates
 PAIRWISE_SUMMARY_TEMPLATE = "{zone}_pairwise_summary.csv"
+PAIRWISE_MATRIX_TEMPLATE = "{zone}_pairwise_matrix.csv"
+TIMELINE_TEMPLATE = "{zone}_timeline.csv"
 ONLY_IN_TEMPLATE = "{zone}_v{va}-vs-v{vb}_only-in-v{which}.txt"
 
 # =========================
@@ -45,7 +77,11 @@ ONLY_IN_TEMPLATE = "{zone}_v{va}-vs-v{vb}_only-in-v{which}.txt"
 try:
     import dns.zone
     import dns.name
+    import dns.exception
+    import dns.rdata
+    import dns.rdataclass
     import dns.rdatatype
+    import dns.ipv6
 except ImportError:
     sys.stderr.write("This script requires dnspython. Install with:\n  pip install dnspython\n")
     sys.exit(1)
@@ -102,6 +138,19 @@ def infer_origin_from_prefix(prefix: str) -> str:
 
 
 def parse_zone_records(file_path: str, origin_text: str) -> set[str]:
+    """
+    Return the set of canonical record strings "<owner_fqdn> <TYPE> <rdata_text>" for one zone file.
+    Tries the canonical line parser first (if FAST_CANON_PARSER) and uses the full dnspython
+    parse whenever the file is not plain canonical output; both yield identical sets.
+    """
+    if FAST_CANON_PARSER:
+        recs = parse_canonical_records(file_path, origin_text)
+        if recs is not None:
+            return recs
+    return parse_zone_records_dnspython(file_path, origin_text)
+
+
+def parse_zone_records_dnspython(file_path: str, origin_text: str) -> set[str]:
     """
     Parse zone with dnspython and return a set of canonical record strings:
       "<owner_fqdn> <TYPE> <rdata_text>"
@@ -135,78 +184,697 @@ def parse_zone_records(file_path: str, origin_text: str) -> set[str]:
     return recs
 
 
-def ensure_dir(path: str):
-    os.makedirs(path, exist_ok=True)
+# --- Canonical fast path ---
+# Names dnspython prints verbatim: no escapes, labels <= 63 chars, name <= 254 chars
+_SAFE_NAME = re.compile(r"(?:[A-Za-z0-9_*/-]{1,63}\.)+\Z")
+_IPV4 = re.compile(r"(?:(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\.){3}(?:25[0-5]|2[0-4]\d|1\d\d|[1-9]?\d)\Z", re.ASCII)
+_UINT16 = re.compile(r"(?:0|[1-9]\d{0,4})\Z", re.ASCII)
+_TXT_STRINGS = re.compile(r'"[\x20\x21\x23-\x5b\x5d-\x7e]{0,255}"(?:[ \t]+"[\x20\x21\x23-\x5b\x5d-\x7e]{0,255}")*\Z')
+_TXT_STRING = re.compile(r'"[^"]*"')
+_QUOTED = re.compile(r'"(?:[^"\\]|\\.)*"')
+_NAME_RDATA_TYPES = {"NS", "CNAME", "PTR", "DNAME"}
+_TXT_TYPES = {"TXT", "SPF"}
+_NEUTRAL_TYPES = {"NSEC", "NSEC3", "KEY"}   # may coexist with CNAME (see dns.node.NodeKind)
 
 
-def write_list(path: str, lines: list[str]):
-    with open(path, "w", encoding="utf-8") as f:
-        for s in lines:
-            f.write(s + "\n")
+class _NeedFullParse(Exception):
+    """The file is not plain canonical output; parse it with dnspython instead."""
+
+
+def _safe_name(text: str) -> bool:
+    return len(text) <= 254 and _SAFE_NAME.match(text) is not None
+
+
+def _ttl(text: str) -> bool:
+    """Plain decimal TTL that dnspython accepts (ASCII digits, at most 2**32 - 1)."""
+    return text.isascii() and text.isdigit() and int(text) <= 0xFFFFFFFF
+
+
+def _uint16(text: str) -> bool:
+    return _UINT16.match(text) is not None and int(text) <= 65535
+
+
+def _fast_rdata(rtype: str, rdata: str) -> str | None:
+    """
+    Return rdata exactly as dnspython's to_text() would print it, or None if unsure.
+    """
+    if rtype == "A":
+        return rdata if _IPV4.match(rdata) else None
+    if rtype == "AAAA":
+        if "." in rdata or " " in rdata or "\t" in rdata:
+            return None  # embedded IPv4 notation → let dnspython decide
+        return dns.ipv6.inet_ntoa(dns.ipv6.inet_aton(rdata))
+    if rtype in _NAME_RDATA_TYPES:
+        return rdata if _safe_name(rdata) else None
+    if rtype == "MX":
+        parts = rdata.split()
+        if len(parts) == 2 and _uint16(parts[0]) and _safe_name(parts[1]):
+            return " ".join(parts)
+        return None
+    if rtype == "SRV":
+        parts = rdata.split()
+        if len(parts) == 4 and all(_uint16(p) for p in parts[:3]) and _safe_name(parts[3]):
+            return " ".join(parts)
+        return None
+    if rtype in _TXT_TYPES:
+        if _TXT_STRINGS.match(rdata):
+            return " ".join(_TXT_STRING.findall(rdata))
+        return None
+    return None
+
+
+def iter_canonical_records(file_path: str, origin_text: str, check_kinds: bool = True):
+    """
+    Streaming parser for canonical zone files ("owner TTL IN TYPE rdata", absolute owners, one per line).
+    Yields exactly the records of parse_zone_records_dnspython() (possibly repeated); lines whose rdata
+    it cannot reproduce verbatim are converted with dns.rdata. Raises _NeedFullParse, possibly after
+    yielding records, when the whole file needs dnspython (directives, continuation lines, multi-line
+    records, missing SOA/NS, bad rdata, and, if check_kinds, CNAME-and-other-data conflicts).
+    check_kinds=False leaves the conflict check to the caller and keeps memory independent of zone size.
+    """
+    origin_lc = (origin_text if origin_text.endswith(".") else origin_text + ".").lower()
+    in_zone_suffix = "." + origin_lc
+    origin = None  # dns.name.Name, only built if a line needs dnspython
+    kinds: dict[str, int] = {}  # owner → bit 1 regular data, bit 2 CNAME data
+    has_soa = has_ns = False
+    try:
+        with open(file_path, encoding="utf-8") as f:
+            for line in f:
+                if not line.strip() or line.lstrip().startswith(";"):
+                    continue
+                if line[0] in " \t$":
+                    raise _NeedFullParse  # owner continuation or $ORIGIN/$TTL/$INCLUDE/...
+                fields = line.split(None, 4)
+                if len(fields) != 5:
+                    raise _NeedFullParse
+                owner, ttl, rdclass, rtype, rdata = fields
+                rdata = rdata.rstrip()
+                if not _ttl(ttl) or rdclass.upper() != "IN" or not _safe_name(owner):
+                    raise _NeedFullParse
+                if "(" in _QUOTED.sub("", rdata):
+                    raise _NeedFullParse  # multi-line record
+                owner = owner.lower()
+                if owner != origin_lc and not owner.endswith(in_zone_suffix):
+                    continue  # dnspython silently skips out-of-zone names
+
+                rtype = rtype.upper()
+                known = rtype in _NAME_RDATA_TYPES or rtype in _TXT_TYPES or rtype in ("A", "AAAA", "MX", "SRV")
+                if not known:
+                    rdtype = dns.rdatatype.from_text(rtype)
+                    rtype = dns.rdatatype.to_text(rdtype).upper()
+
+                if check_kinds:
+                    kind = _node_kind(rtype, rdata)
+                    if kind:
+                        kinds[owner] = kinds.get(owner, 0) | kind
+                if owner == origin_lc:
+                    has_soa = has_soa or rtype == "SOA"
+                    has_ns = has_ns or rtype == "NS"
+
+                if rtype in IGNORE_TYPES:
+                    continue
+                text = _fast_rdata(rtype, rdata) if known else None
+                if text is None:
+                    if origin is None:
+                        origin = dns.name.from_text(origin_lc)
+                    rd = dns.rdata.from_text(dns.rdataclass.IN, dns.rdatatype.from_text(rtype), rdata,
+                                             origin=origin, relativize=False)
+                    text = rd.to_text()
+                yield f"{owner} {rtype} {text}"  # TTL intentionally omitted
+    except (UnicodeDecodeError, dns.exception.DNSException, ValueError) as e:
+        raise _NeedFullParse from e
+    if not has_soa or not has_ns or any(k == 3 for k in kinds.values()):
+        raise _NeedFullParse
+
+
+def _node_kind(rtype: str, rdata: str) -> int:
+    """dns.node.NodeKind of an rdataset as bits: 1 regular data, 2 CNAME data, 0 neutral."""
+    if rtype == "RRSIG":
+        rtype = dns.rdatatype.to_text(dns.rdatatype.from_text(rdata.split(None, 1)[0])).upper()
+    if rtype == "CNAME":
+        return 2
+    return 0 if rtype in _NEUTRAL_TYPES else 1
+
+
+def parse_canonical_records(file_path: str, origin_text: str) -> set[str] | None:
+    """
+    Record set of a canonical zone file via iter_canonical_records(), or None if it needs dnspython.
+    """
+    try:
+        return set(iter_canonical_records(file_path, origin_text))
+    except _NeedFullParse:
+        return None
+
+
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def pack_records(recs: set[str]) -> str:
+    return "\n".join(sorted(recs))
+
+
+def unpack_records(packed: str) -> list[str]:
+    return packed.split("\n") if packed else []
+
+
+def cached_parse(file_path: str, zone_name: str, cache_dir: str) -> str:
+    """
+    Return the packed record set of one version file, from cache_dir if the entry still matches.
+    A cache entry is CACHE_MAGIC, a JSON key line, then the zlib-compressed packed records.
+    Size + mtime decide cheaply; if only the mtime moved, the content hash decides.
+    """
+    st = os.stat(file_path)
+    abspath = os.path.abspath(file_path)
+    key = {"path": abspath, "origin": zone_name, "ignore_types": sorted(IGNORE_TYPES),
+           "size": st.st_size, "mtime_ns": st.st_mtime_ns}
+    entry_path = os.path.join(cache_dir, hashlib.sha1(abspath.encode("utf-8")).hexdigest() + ".zvc")
+
+    digest = None
+    try:
+        with open(entry_path, "rb") as f:
+            if f.readline() == CACHE_MAGIC:
+                cached = json.loads(f.readline())
+                body = f.read()
+                same_key = all(cached.get(k) == v for k, v in key.items() if k != "mtime_ns")
+                if same_key and cached.get("mtime_ns") == st.st_mtime_ns:
+                    return zlib.decompress(body).decode("utf-8")
+                if same_key:
+                    digest = file_sha256(file_path)
+                    if cached.get("sha256") == digest:
+                        packed = zlib.decompress(body).decode("utf-8")
+                        write_cache_entry(entry_path, dict(key, sha256=digest), packed)
+                        return packed
+    except (OSError, ValueError, zlib.error):
+        pass  # missing or unreadable entry → parse
+
+    packed = pack_records(parse_zone_records(file_path, zone_name))
+    write_cache_entry(entry_path, dict(key, sha256=digest or file_sha256(file_path)), packed)
+    return packed
+
+
+def write_cache_entry(entry_path: str, key: dict, packed: str):
+    tmp = f"{entry_path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(CACHE_MAGIC)
+        f.write(json.dumps(key, sort_keys=True).encode("utf-8") + b"\n")
+        f.write(zlib.compress(packed.encode("utf-8"), 1))
+    os.replace(tmp, entry_path)
+
+
+def parse_version_task(task: tuple[str, str, str | None]) -> tuple[str | None, str | None]:
+    """
+    Process-pool worker: parse one version file (or load it from the cache).
+    Returns (records, error) with the record set packed into one newline-joined string,
+    which pickles far faster than a set of millions of small strings.
+    """
+    file_path, zone_name, cache_dir = task
+    try:
+        if cache_dir:
+            return cached_parse(file_path, zone_name, cache_dir), None
+        return pack_records(parse_zone_records(file_path, zone_name)), None
+    except Exception as e:
+        return None, str(e)
+
+
+def iter_parsed_versions(tasks: list[tuple[str, str, str | None]], jobs: int):
+    """
+    Yield (records, error) for each (file_path, zone_name, cache_dir) task, in task order;
+    records is an iterable of unique record strings (set or list).
+    jobs <= 1 parses in-process; otherwise a process pool works ahead on a bounded window of
+    tasks so finished-but-unconsumed record sets never pile up for all zones at once.
+    """
+    if jobs <= 1:
+        for file_path, zone_name, cache_dir in tasks:
+            try:
+                if cache_dir:
+                    yield unpack_records(cached_parse(file_path, zone_name, cache_dir)), None
+                else:
+                    yield parse_zone_records(file_path, zone_name), None
+            except Exception as e:
+                yield None, str(e)
+        return
+
+    for packed, err in iter_in_order(parse_version_task, tasks, jobs):
+        if err is not None:
+            yield None, err
+        else:
+            yield unpack_records(packed), None
+
+
+def iter_in_order(func, tasks: list, jobs: int):
+    """
+    Yield func(task) for each task, in task order. jobs <= 1 runs in-process; otherwise a process pool
+    works ahead on a bounded window of tasks so finished-but-unconsumed results never pile up.
+    """
+    if jobs <= 1:
+        for task in tasks:
+            yield func(task)
+        return
+
+    window = jobs * 2
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        pending = deque()
+        it = iter(tasks)
+        for task in it:
+            pending.append(pool.submit(func, task))
+            if len(pending) >= window:
+                break
+        while pending:
+            result = pending.popleft().result()
+            nxt = next(it, None)
+            if nxt is not None:
+                pending.append(pool.submit(func, nxt))
+            yield result
 
 
 # =========================
-# Main
+# External sort (--external-sort)
 # =========================
-def main():
-    ap = argparse.ArgumentParser(description="Pairwise diff of multi-version DNS zones (simplified)")
-    ap.add_argument("root", help="Directory containing normalized zone files")
-    args = ap.parse_args()
+def _read_sorted(path: str):
+    """Records of a sorted run/version file, one per line."""
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            yield line[:-1]
 
-    out_root = os.path.join(args.root, OUTPUT_DIR_NAME)
-    ensure_dir(out_root)
 
-    # "ls" style listing of all matched files (unfiltered by EXCLUDE_MSDCS)
-    matched = sorted(glob.glob(os.path.join(args.root, GLOB_PATTERN)))
-    write_list(os.path.join(out_root, FILELIST_NAME), [os.path.relpath(p, args.root) for p in matched])
+def _write_run(path: str, recs: list[str]):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(r + "\n" for r in recs)
 
-    groups = collect_groups(args.root)
-    if not groups:
-        sys.stderr.write("No files matched GLOB_PATTERN; adjust GLOB_PATTERN or check directory.\n")
-        sys.exit(2)
 
-    summary_rows = []          # (zone_prefix, va, vb, only_a_count, only_b_count)
-    zonenames_lower = set()    # for zonelist.txt
+def _iter_unique_checked(recs, check_kinds: bool):
+    """
+    Drop duplicates from a sorted record stream. With check_kinds, raise _NeedFullParse on a
+    CNAME-and-other-data owner; records of one owner are adjacent in sorted order.
+    """
+    prev = None
+    owner = None
+    kind = 0
+    for rec in recs:
+        if rec == prev:
+            continue
+        prev = rec
+        if check_kinds:
+            rec_owner, rtype, rdata = rec.split(" ", 2)
+            if rec_owner != owner:
+                owner, kind = rec_owner, 0
+            kind |= _node_kind(rtype, rdata)
+            if kind == 3:
+                raise _NeedFullParse
+        yield rec
+
+
+def external_sort_records(recs, out_path: str, buffer_bytes: int, check_kinds: bool = False,
+                          fan_in: int = SORT_MERGE_FAN_IN) -> int:
+    """
+    Write the unique records of an iterable to out_path in sorted order, holding at most about
+    buffer_bytes of records in memory: full buffers are sorted into run files next to out_path,
+    then k-way merged. More than fan_in runs are first merged in passes of fan_in, so at most
+    fan_in run files are open at once. Returns the number of unique records.
+    """
+    created: list[str] = []  # every run file written, removed in the end
+    runs: list[str] = []
+    buf: list[str] = []
+    size = 0
+    try:
+        for rec in recs:
+            buf.append(rec)
+            size += len(rec) + 64  # rough per-string overhead of CPython str + list slot
+            if size >= buffer_bytes:
+                buf.sort()
+                run_path = f"{out_path}.run{len(created)}"
+                created.append(run_path)
+                _write_run(run_path, buf)
+                runs.append(run_path)
+                buf, size = [], 0
+        buf.sort()
+        if runs:
+            if buf:
+                run_path = f"{out_path}.run{len(created)}"
+                created.append(run_path)
+                _write_run(run_path, buf)
+                runs.append(run_path)
+                buf = []
+            while len(runs) > fan_in:
+                merged_runs = []
+                for i in range(0, len(runs), fan_in):
+                    group = runs[i:i + fan_in]
+                    if len(group) == 1:
+                        merged_runs.append(group[0])
+                        continue
+                    run_path = f"{out_path}.run{len(created)}"
+                    created.append(run_path)
+                    with open(run_path, "w", encoding="utf-8") as f:
+                        f.writelines(r + "\n" for r in heapq.merge(*(_read_sorted(g) for g in group)))
+                    for g in group:
+                        os.remove(g)
+                    merged_runs.append(run_path)
+                runs = merged_runs
+            merged = heapq.merge(*(_read_sorted(r) for r in runs))
+        else:
+            merged = iter(buf)
+        n = 0
+        with open(out_path, "w", encoding="utf-8") as f:
+            for rec in _iter_unique_checked(merged, check_kinds):
+                f.write(rec + "\n")
+                n += 1
+        return n
+    finally:
+        for r in created:
+            if os.path.exists(r):
+                os.remove(r)
+
+
+def sorted_version_path(sort_tmp: str, zone_index: int, zone_name: str, ver: int) -> str:
+    """Temp file of one sorted version; zone_index keeps prefix groups that map to the same zone apart."""
+    return os.path.join(sort_tmp, f"{zone_index}_{zone_name}_v{ver}.sorted")
+
+
+def sort_version_file(file_path: str, zone_name: str, out_path: str, buffer_bytes: int) -> int:
+    """
+    Parse one version file into a sorted, de-duplicated record file with bounded memory.
+    Canonical files stream through the line parser; anything it rejects is parsed by dnspython
+    in memory (same fallback as parse_zone_records). Returns the number of records.
+    """
+    if FAST_CANON_PARSER:
+        try:
+            return external_sort_records(iter_canonical_records(file_path, zone_name, check_kinds=False),
+                                         out_path, buffer_bytes, check_kinds=True)
+        except _NeedFullParse:
+            pass
+    return external_sort_records(parse_zone_records_dnspython(file_path, zone_name), out_path, buffer_bytes)
+
+
+def sort_version_task(task: tuple[str, str, str, int]) -> tuple[int | None, str | None]:
+    """Pool worker: (file_path, zone_name, out_path, buffer_bytes) → (record count, error)."""
+    file_path, zone_name, out_path, buffer_bytes = task
+    try:
+        return sort_version_file(file_path, zone_name, out_path, buffer_bytes), None
+    except Exception as e:
+        if os.path.exists(out_path):
+            os.remove(out_path)
+        return None, str(e)
 
-    # Iterate per zone prefix
-    for group_key, versions in sorted(groups.items()):
-        zone_name = infer_origin_from_prefix(group_key).lower()
 
-        # Optional exclusion of _msdcs.* zones
-        if EXCLUDE_MSDCS and zone_name.startswith("_msdcs."):
+_NONZERO_BYTES = re.compile(rb"[^\x00]+")
+
+
+def counts_from_patterns(patterns: Counter, vers: list[int]) -> dict[tuple[int, int], int]:
+    """
+    {(va, vb): records in va but not in vb} from {presence mask: record count}; bit k ↔ vers[k].
+    """
+    counts = {}
+    for a, va in enumerate(vers):
+        for b, vb in enumerate(vers):
+            if a != b:
+                counts[(va, vb)] = sum(n for m, n in patterns.items() if (m >> a) & 1 and not (m >> b) & 1)
+    return counts
+
+
+def mask_lifecycle(mask: int, vers: list[int]) -> tuple[int, int, int, str]:
+    """
+    (first_seen, last_seen, versions_present, gaps) for one presence mask (bit k ↔ vers[k]); gaps lists
+    the versions between first and last seen that lack the record, as "3;5-6" (in version order).
+    """
+    present = [(mask >> k) & 1 for k in range(len(vers))]
+    idx = [i for i, p in enumerate(present) if p]
+    first, last = idx[0], idx[-1]
+    runs = []
+    i = first
+    while i <= last:
+        if present[i]:
+            i += 1
             continue
+        j = i
+        while not present[j + 1]:
+            j += 1
+        runs.append(f"{vers[i]}" if i == j else f"{vers[i]}-{vers[j]}")
+        i = j + 1
+    return vers[first], vers[last], len(idx), ";".join(runs)
+
+
+def iter_timeline_rows(records_with_masks, vers: list[int]):
+    """
+    Yield (record, first_seen, last_seen, versions_present, gaps) for (record, mask) pairs.
+    Records share few distinct masks, so each mask is decoded only once.
+    """
+    decoded: dict[int, tuple[int, int, int, str]] = {}
+    for rec, mask in records_with_masks:
+        info = decoded.get(mask)
+        if info is None:
+            info = decoded[mask] = mask_lifecycle(mask, vers)
+        yield (rec, *info)
+
 
+class ZoneRecordIndex:
+    """
+    All versions of one zone as bitmaps over a shared, interned record table.
+    Each distinct record string is stored once; IDs follow sorted record order, so walking
+    a bitmap's set bits yields records already sorted. A version costs one bit per record.
+    The transposed view, presence[record ID] = mask of versions containing it, is built alongside.
+    """
+    def __init__(self):
+        self._ids: dict[str, int] = {}               # record → provisional ID (insertion order)
+        self._pending: dict[int, array] = {}         # version → provisional IDs
+        self.records: list[str] = []                 # final ID → record
+        self.bitmaps: dict[int, int] = {}            # version → bitmap (Python int)
+        self.version_bit: dict[int, int] = {}        # version → bit position in presence masks
+        self.presence = array("Q")                   # final ID → version mask (list if > 64 versions)
+
+    def add_version(self, ver: int, records):
+        ids = self._ids
+        self._pending[ver] = array("L", (ids.setdefault(r, len(ids)) for r in records))
+
+    def freeze(self):
+        """Assign final IDs in sorted order and turn every version into a bitmap."""
+        self.records = sorted(self._ids)
+        rank = array("L", bytes(array("L").itemsize * len(self.records)))
+        ids = self._ids
+        for new_id, rec in enumerate(self.records):
+            rank[ids[rec]] = new_id
+        self._ids = {}
+        nbytes = (len(self.records) + 7) // 8
+        if len(self._pending) <= 64:
+            presence = array("Q", bytes(8 * len(self.records)))
+        else:
+            presence = [0] * len(self.records)
+        for k, ver in enumerate(sorted(self._pending)):
+            self.version_bit[ver] = k
+            vbit = 1 << k
+            bits = bytearray(nbytes)
+            for pid in self._pending[ver]:
+                r = rank[pid]
+                bits[r >> 3] |= 1 << (r & 7)
+                presence[r] |= vbit
+            self.bitmaps[ver] = int.from_bytes(bits, "little")
+        self.presence = presence
+        self._pending = {}
+
+    def versions(self) -> list[int]:
+        return sorted(self.bitmaps)
+
+    def pairwise_counts(self) -> dict[tuple[int, int], int]:
+        """
+        {(va, vb): number of records in va but not in vb} for every ordered version pair,
+        from one pass over the presence masks; no per-pair difference is materialized.
+        """
+        return counts_from_patterns(Counter(self.presence), self.versions())
+
+    def iter_timeline(self):
+        """Yield (record, first_seen, last_seen, versions_present, gaps) per record in sorted order."""
+        return iter_timeline_rows(zip(self.records, self.presence), self.versions())
+
+    def write_only_in(self, va: int, vb: int, path_a: str, path_b: str) -> tuple[int, int]:
+        """Write the sorted records only in va / only in vb; return both counts."""
+        only_a = self.only_in(va, vb)
+        only_b = self.only_in(vb, va)
+        write_list(path_a, self.iter_records(only_a))
+        write_list(path_b, self.iter_records(only_b))
+        return bin(only_a).count("1"), bin(only_b).count("1")
+
+    def only_in(self, va: int, vb: int) -> int:
+        """Bitmap of records present in version va but not in vb."""
+        return self.bitmaps[va] & ~self.bitmaps[vb]
+
+    def iter_records(self, bitmap: int):
+        """Yield the records of a bitmap in sorted order."""
+        data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, "little")
+        records = self.records
+        for m in _NONZERO_BYTES.finditer(data):
+            for off in range(m.start(), m.end()):
+                byte = data[off]
+                while byte:
+                    low = byte & -byte
+                    yield records[(off << 3) + low.bit_length() - 1]
+                    byte ^= low
+
+
+class SortedZoneVersions:
+    """
+    All versions of one zone as sorted record files (see sort_version_file), with the same
+    diff interface as ZoneRecordIndex. Every operation is a streaming merge, so memory stays
+    bounded by the number of versions rather than the zone size.
+    """
+
+    def __init__(self, paths: dict[int, str]):
+        self.paths = dict(sorted(paths.items()))  # version → sorted record file
+
+    def versions(self) -> list[int]:
+        return list(self.paths)
+
+    def _iter_masks(self):
+        """Yield (record, presence mask) in sorted order from one k-way merge; bit k ↔ versions()[k]."""
+        streams = [zip(_read_sorted(path), repeat(1 << k)) for k, path in enumerate(self.paths.values())]
+        cur, mask = None, 0
+        for rec, bit in heapq.merge(*streams, key=itemgetter(0)):
+            if rec != cur:
+                if cur is not None:
+                    yield cur, mask
+                cur, mask = rec, 0
+            mask |= bit
+        if cur is not None:
+            yield cur, mask
+
+    def pairwise_counts(self) -> dict[tuple[int, int], int]:
+        """Same as ZoneRecordIndex.pairwise_counts(), from one merge pass over all version files."""
+        return counts_from_patterns(Counter(mask for _, mask in self._iter_masks()), self.versions())
+
+    def iter_timeline(self):
+        """Yield (record, first_seen, last_seen, versions_present, gaps) per record in sorted order."""
+        return iter_timeline_rows(self._iter_masks(), self.versions())
+
+    def write_only_in(self, va: int, vb: int, path_a: str, path_b: str) -> tuple[int, int]:
+        """Merge-join the two sorted version files into only-in-va / only-in-vb files; return both counts."""
+        count_a = count_b = 0
+        a_iter, b_iter = _read_sorted(self.paths[va]), _read_sorted(self.paths[vb])
+        a, b = next(a_iter, None), next(b_iter, None)
+        with open(path_a, "w", encoding="utf-8") as fa, open(path_b, "w", encoding="utf-8") as fb:
+            while a is not None or b is not None:
+                if b is None or (a is not None and a < b):
+                    fa.write(a + "\n")
+                    count_a += 1
+                    a = next(a_iter, None)
+                elif a is None or b < a:
+                    fb.write(b + "\n")
+                    count_b += 1
+                    b = next(b_iter, None)
+                else:
+                    a, b = next(a_iter, None), next(b_iter, None)
+        return count_a, count_b
+
+    def close(self):
+        """Delete the sorted version files."""
+        for path in self.paths.values():
+            os.remove(path)
+
+
+def select_pairs(versions: list[int], mode: str, baseline: int | None) -> list[tuple[int, int]]:
+    """
+    Version pairs (va, vb) to write only-in files for:
+      all         → every combination (va < vb)
+      consecutive → each version against the next one
+      baseline    → the baseline version against every other version
+    """
+    if mode == "consecutive":
+        return list(zip(versions, versions[1:]))
+    if mode == "baseline":
+        return [(baseline, v) for v in versions if v != baseline]
+    return list(combinations(versions, 2))
+
+
+def ensure_dir(path: str):
+    os.makedirs(path, exist_ok=True)
+
+
+def write_list(path: str, lines: Iterable[str]):
+    with open(path, "w", encoding="utf-8") as f:
+        for s in lines:
+            f.write(s + "\n")
+
+
+def diff_zones(zones, parsed, out_root: str, args, sort_tmp: str | None, zonenames_lower: set[str]) -> list:
+    """
+    Write the per-zone reports; parsed yields one result per version, in zone order
+    ((records, error) in memory, (record count, error) with --external-sort).
+    Returns the global summary rows.
+    """
+    summary_rows = []          # (zone_prefix, va, vb, only_a_count, only_b_count)
+
+    # Iterate per zone prefix
+    for zone_index, (zone_name, versions) in enumerate(zones):
         zonenames_lower.add(zone_name)
 
         zone_dir = os.path.join(out_root, ZONE_DIR_TEMPLATE.format(zone=zone_name))
         ensure_dir(zone_dir)
 
-        recs_by_ver: dict[int, set[str]] = {}
         errors: list[str] = []
 
         # Parse each version
-        for ver, file_path in sorted(versions.items()):
-            try:
-                recs_by_ver[ver] = parse_zone_records(file_path, zone_name)
-            except Exception as e:
-                errors.append(f"[v{ver}] {os.path.basename(file_path)}: {e}")
+        if sort_tmp:
+            sorted_paths = {}
+            for ver, file_path in versions:
+                _count, err = next(parsed)
+                if err is None:
+                    sorted_paths[ver] = sorted_version_path(sort_tmp, zone_index, zone_name, ver)
+                else:
+                    errors.append(f"[v{ver}] {os.path.basename(file_path)}: {err}")
+            index = SortedZoneVersions(sorted_paths)
+        else:
+            index = ZoneRecordIndex()
+            for ver, file_path in versions:
+                recs, err = next(parsed)
+                if err is None:
+                    index.add_version(ver, recs)
+                else:
+                    errors.append(f"[v{ver}] {os.path.basename(file_path)}: {err}")
+                del recs  # only the interned copy of each record stays alive
+            index.freeze()
 
         if errors:
             write_list(os.path.join(zone_dir, ERRORS_NAME), errors)
 
-        if len(recs_by_ver) < 2:
+        if len(index.versions()) < 2:
             write_list(os.path.join(zone_dir, NOTE_NAME),
-                       [f"Found {len(recs_by_ver)} parsable version(s); need >=2 for diffs."])
+                       [f"Found {len(index.versions())} parsable version(s); need >=2 for diffs."])
+            if sort_tmp:
+                index.close()
             continue
 
-        # Pairwise diffs only
+        # Every pairwise count from the presence matrix, in all modes
+        counts = index.pairwise_counts()
+        vers = index.versions()
+        per_zone_matrix = os.path.join(zone_dir, PAIRWISE_MATRIX_TEMPLATE.format(zone=zone_name))
+        with open(per_zone_matrix, "w", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            w.writerow(["only_in/not_in"] + [f"v{v}" for v in vers])
+            for va in vers:
+                w.writerow([f"v{va}"] + ["" if va == vb else counts[(va, vb)] for vb in vers])
+
+        # Record lifecycle across all versions, one row per distinct record
+        if args.timeline:
+            timeline_path = os.path.join(zone_dir, TIMELINE_TEMPLATE.format(zone=zone_name))
+            with open(timeline_path, "w", newline="", encoding="utf-8") as f:
+                w = csv.writer(f)
+                w.writerow(["owner", "type", "rdata", "first_seen", "last_seen", "versions_present", "gaps"])
+                for rec, first, last, present, gaps in index.iter_timeline():
+                    owner, rtype, rdata = rec.split(" ", 2)
+                    w.writerow([owner, rtype, rdata, first, last, present, gaps])
+
+        baseline = None
+        if args.mode == "baseline":
+            baseline = args.baseline if args.baseline in vers else vers[0]
+            if args.baseline is not None and baseline != args.baseline:
+                write_list(os.path.join(zone_dir, NOTE_NAME),
+                           [f"Baseline v{args.baseline} not available; used v{baseline} instead."])
+
+        # Only-in files for the selected pairs
         pair_summary = []
-        for (va, vb) in combinations(sorted(recs_by_ver.keys()), 2):
-            a = recs_by_ver[va]
-            b = recs_by_ver[vb]
-            only_a = sorted(a - b)
-            only_b = sorted(b - a)
-
+        for (va, vb) in select_pairs(vers, args.mode, baseline):
             # Per pair "only-in" files WITH zone name
             only_a_path = os.path.join(
                 zone_dir,
@@ -216,11 +884,9 @@ def main():
                 zone_dir,
                 ONLY_IN_TEMPLATE.format(zone=zone_name, va=va, vb=vb, which=vb)
             )
-            write_list(only_a_path, only_a)
-            write_list(only_b_path, only_b)
-
-            pair_summary.append((va, vb, len(only_a), len(only_b)))
-            summary_rows.append((zone_name, va, vb, len(only_a), len(only_b)))
+            count_a, count_b = index.write_only_in(va, vb, only_a_path, only_b_path)
+            pair_summary.append((va, vb, count_a, count_b))
+            summary_rows.append((zone_name, va, vb, count_a, count_b))
 
         # Per-zone summary CSV WITH zone name in filename
         per_zone_summary = os.path.join(zone_dir, PAIRWISE_SUMMARY_TEMPLATE.format(zone=zone_name))
@@ -230,6 +896,92 @@ def main():
             for (va, vb, ca, cb) in pair_summary:
                 w.writerow([zone_name, va, vb, ca, cb])
 
+        if sort_tmp:
+            index.close()
+
+    return summary_rows
+
+
+# =========================
+# Main
+# =========================
+def main():
+    ap = argparse.ArgumentParser(description="Pairwise diff of multi-version DNS zones (simplified)")
+    ap.add_argument("root", help="Directory containing normalized zone files")
+    ap.add_argument("--jobs", type=int, default=1, metavar="N",
+                    help="parse version files in N worker processes (default: 1; 0 = all CPU cores)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help=f"do not read or write the parsed-zone cache ({OUTPUT_DIR_NAME}/{CACHE_DIR_NAME})")
+    ap.add_argument("--mode", choices=["all", "consecutive", "baseline"], default="all",
+                    help="version pairs to diff: all pairs (default), v(n) vs v(n+1), or --baseline vs every other")
+    ap.add_argument("--baseline", type=int, metavar="VER",
+                    help="reference version for --mode baseline (default: lowest version of each zone)")
+    ap.add_argument("--timeline", action="store_true",
+                    help="write a per-zone record lifecycle table (first/last version seen, gaps)")
+    ap.add_argument("--external-sort", action="store_true",
+                    help="diff via sorted temporary files with bounded memory, for zones too large for RAM "
+                         "(bypasses the parse cache)")
+    ap.add_argument("--sort-buffer-mb", type=int, default=SORT_BUFFER_MB, metavar="MB",
+                    help=f"records held in memory per worker before spilling a sorted run (default: {SORT_BUFFER_MB})")
+    ap.add_argument("--tmp-dir", metavar="DIR",
+                    help=f"directory for --external-sort temporary files (default: inside {OUTPUT_DIR_NAME})")
+    args = ap.parse_args()
+    if args.baseline is not None and args.mode != "baseline":
+        ap.error("--baseline requires --mode baseline")
+    if (args.sort_buffer_mb != SORT_BUFFER_MB or args.tmp_dir) and not args.external_sort:
+        ap.error("--sort-buffer-mb and --tmp-dir require --external-sort")
+    if args.sort_buffer_mb < 1:
+        ap.error("--sort-buffer-mb must be >= 1")
+    if args.jobs < 0:
+        sys.stderr.write("--jobs must be >= 0\n")
+        sys.exit(2)
+    jobs = args.jobs or os.cpu_count() or 1
+
+    out_root = os.path.join(args.root, OUTPUT_DIR_NAME)
+    ensure_dir(out_root)
+    cache_dir = None
+    if not args.no_cache and not args.external_sort:
+        cache_dir = os.path.join(out_root, CACHE_DIR_NAME)
+        ensure_dir(cache_dir)
+
+    # "ls" style listing of all matched files (unfiltered by EXCLUDE_MSDCS)
+    matched = sorted(glob.glob(os.path.join(args.root, GLOB_PATTERN)))
+    write_list(os.path.join(out_root, FILELIST_NAME), [os.path.relpath(p, args.root) for p in matched])
+
+    groups = collect_groups(args.root)
+    if not groups:
+        sys.stderr.write("No files matched GLOB_PATTERN; adjust GLOB_PATTERN or check directory.\n")
+        sys.exit(2)
+
+    zonenames_lower = set()    # for zonelist.txt
+
+    # Zones to process, in output order
+    zones = []
+    for group_key, versions in sorted(groups.items()):
+        zone_name = infer_origin_from_prefix(group_key).lower()
+
+        # Optional exclusion of _msdcs.* zones
+        if EXCLUDE_MSDCS and zone_name.startswith("_msdcs."):
+            continue
+        zones.append((zone_name, sorted(versions.items())))
+
+    # Every version file of every zone, parsed serially or in a pool, consumed in this same order
+    sort_tmp = None
+    if args.external_sort:
+        sort_tmp = tempfile.mkdtemp(prefix=".sort_", dir=args.tmp_dir or out_root)
+        buffer_bytes = args.sort_buffer_mb << 20
+        parsed = iter_in_order(sort_version_task, [
+            (file_path, zone_name, sorted_version_path(sort_tmp, zone_index, zone_name, ver), buffer_bytes)
+            for zone_index, (zone_name, versions) in enumerate(zones) for ver, file_path in versions], jobs)
+    else:
+        parsed = iter_parsed_versions(
+            [(file_path, zone_name, cache_dir) for zone_name, versions in zones for _, file_path in versions], jobs)
+    try:
+        summary_rows = diff_zones(zones, parsed, out_root, args, sort_tmp, zonenames_lower)
+    finally:
+        if sort_tmp:
+            shutil.rmtree(sort_tmp, ignore_errors=True)
+
     # Global zonelist (unique zones, lowercase; respects EXCLUDE_MSDCS)
     write_list(os.path.join(out_root, ZONELIST_NAME), sorted(zonenames_lower))
 